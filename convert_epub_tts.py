@@ -13,47 +13,87 @@ Com pausas naturais entre títulos, capítulos e parágrafos.
 """
 
 import argparse
+import contextlib
 import re
 import sys
 import subprocess
 import os
 import asyncio
+import functools
+import importlib.util
+import hashlib
 import json
+import multiprocessing
+import pickle
+import posixpath
+import shutil
+import zipfile
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Tuple, Dict
+from typing import List, Tuple, Dict, BinaryIO
+from urllib.parse import unquote
 
-import ebooklib
-from ebooklib import epub
 from bs4 import BeautifulSoup
 
+try:
+    # libxml2 (C): percorre a árvore direto, bem mais rápido que BeautifulSoup
+    from lxml import etree as lxml_etree
+    _XHTML_PARSER = lxml_etree.XMLParser(remove_comments=True, remove_pis=True, resolve_entities=False)
+    _LXML_HTML_PARSER = lxml_etree.HTMLParser(remove_comments=True, remove_pis=True)
+    _LXML_HTML_UTF8_PARSER = lxml_etree.HTMLParser(remove_comments=True, remove_pis=True, encoding="utf-8")
+except ImportError:
+    lxml_etree = None
+
 try:
     import edge_tts
 except ImportError:
     edge_tts = None
 
+# Formato de saída nativo do Edge-TTS -> (bitrate, sample rate, canais).
+# Quando o alvo coincide, os bytes MP3 vão direto para o arquivo, sem ffmpeg.
+EDGE_OUTPUT_FORMATS = {
+    "audio-24khz-48kbitrate-mono-mp3": ("48k", 24000, 1),
+}
+
+# Coqui (e torch) só são importados ao carregar o modelo: o import custa
+# segundos e não deve atrasar Edge/Piper nem o --help
+COQUI_AVAILABLE = importlib.util.find_spec("TTS") is not None
+
 try:
-    import TTS
-    from TTS.api import TTS as CoquiTTS
+    import orjson
 except ImportError:
-    TTS = None
+    orjson = None
 
-FORBIDDEN_FS_CHARS = r"\\/:*?\"<>|\n\r\t"
-_forbidden_re = re.compile(f"[{FORBIDDEN_FS_CHARS}]")
+try:
+    from tqdm import tqdm
+except ImportError:
+    tqdm = None
+
+FORBIDDEN_FS_CHARS = "\\/:*?\"<>|\n\r\t"
+_forbidden_table = str.maketrans({c: "-" for c in FORBIDDEN_FS_CHARS})
 _multiple_space_re = re.compile(r"\s+")
+_section_re = re.compile(r"(\.\.\. \.\.\.)")
+_paragraph_re = re.compile(r"\n\n+")
+_sentence_re = re.compile(r"[.!?]+")
 
+@functools.lru_cache(maxsize=4096)
 def sanitize_filename(name: str, max_len: int = 120) -> str:
-    """Sanitiza nome do arquivo removendo caracteres proibidos."""
+    """Sanitiza nome do arquivo removendo caracteres proibidos (memoizado: função pura)."""
     name = name.strip()
     name = _multiple_space_re.sub(" ", name)
-    name = _forbidden_re.sub("-", name)
+    name = name.translate(_forbidden_table)
     if not name:
         name = "Sem título"
     return name[:max_len].rstrip(" .")
 
+def pad_width(total: int) -> int:
+    """Largura do índice com zero padding para `total` itens (mínimo 2)."""
+    return max(2, len(str(total)))
+
 def zero_pad(i: int, total: int) -> str:
     """Retorna número com zero padding baseado no total."""
-    width = max(2, len(str(total)))
-    return str(i).zfill(width)
+    return f"{i:0{pad_width(total)}d}"
 
 def _html_title(soup: BeautifulSoup) -> str | None:
     """Extrai título do HTML."""
@@ -94,9 +134,118 @@ def _is_subtitle(text: str) -> bool:
     
     return False
 
-def _extract_text(html_bytes: bytes) -> Tuple[str | None, str]:
-    """Extrai título e texto limpo do HTML preservando estrutura hierárquica."""
-    soup = BeautifulSoup(html_bytes, "html.parser")
+_HEADER_TAGS = frozenset(("h1", "h2", "h3", "h4", "h5", "h6"))
+_BLOCK_TAGS = _HEADER_TAGS | {"p", "div"}
+_repeated_pauses_re = re.compile(r"(\.\.\. \.\.\.){3,}")
+
+def _extract_text(html: bytes | BinaryIO) -> Tuple[str | None, str]:
+    """Extrai título e texto limpo do HTML preservando estrutura hierárquica.
+    
+    Com lxml a árvore do libxml2 é percorrida diretamente; sem lxml,
+    cai no BeautifulSoup com html.parser (mesmo resultado, mais lento).
+    """
+    if lxml_etree is not None:
+        title, text_elements = _lxml_text_elements(html)
+    else:
+        title, text_elements = _soup_text_elements(html)
+    return title, _join_text_elements(text_elements)
+
+def _append_leaf_text(text_elements: list, text: str, depth: int) -> None:
+    """Acrescenta texto de um bloco folha, isolando subtítulos/datas entre pausas."""
+    if _is_subtitle(text):
+        text_elements.append(('pause', '', depth))
+        text_elements.append(('subtitle', text, depth))
+        text_elements.append(('pause', '', depth))
+    else:
+        text_elements.append(('text', text, depth))
+
+def _local_name(tag) -> str | None:
+    """Nome da tag sem namespace (None para entidades/comentários)."""
+    if not isinstance(tag, str):
+        return None
+    return tag.rpartition('}')[2].lower()
+
+def _node_text(element) -> str:
+    """Equivalente ao get_text(strip=True) do BeautifulSoup."""
+    return "".join(s.strip() for s in element.itertext())
+
+def _lxml_text_elements(html: bytes | BinaryIO) -> Tuple[str | None, list]:
+    """Extrai título e elementos de texto com lxml."""
+    data = html.read() if hasattr(html, "read") else html
+    try:
+        # XHTML bem formado (caso comum em EPUB)
+        root = lxml_etree.fromstring(data, _XHTML_PARSER)
+    except lxml_etree.XMLSyntaxError:
+        # Entidades HTML (&nbsp;) ou marcação quebrada. Sem <meta charset> o
+        # parser HTML do libxml2 assume latin-1: força UTF-8 quando válido
+        try:
+            data.decode("utf-8")
+            parser = _LXML_HTML_UTF8_PARSER
+        except UnicodeDecodeError:
+            parser = _LXML_HTML_PARSER
+        root = lxml_etree.fromstring(data, parser)
+    if root is None:
+        return None, []
+    
+    # Remove scripts e styles (mantendo o texto que vem depois deles)
+    lxml_etree.strip_elements(root, "{*}script", "{*}style", with_tail=False)
+    
+    title = None
+    title_el = root.find(".//{*}title")
+    if title_el is not None and len(title_el) == 0 and title_el.text and title_el.text.strip():
+        title = title_el.text.strip()
+    else:
+        for tag in ("h1", "h2", "h3"):
+            h = root.find(f".//{{*}}{tag}")
+            if h is not None and _node_text(h):
+                title = _node_text(h)
+                break
+    
+    text_elements = []
+    
+    # Mesmas regras do caminho BeautifulSoup: só elementos são visitados;
+    # texto solto fora de blocos folha é ignorado
+    def extract_recursive(element, depth=0):
+        name = _local_name(element.tag)
+        if name in _HEADER_TAGS:
+            text = _node_text(element)
+            if text:
+                text_elements.append(('header', text, depth))
+                text_elements.append(('pause', '', depth))
+            return
+        
+        if name in ('p', 'div'):
+            has_children = any(_local_name(d.tag) in _BLOCK_TAGS for d in element.iterdescendants())
+            if has_children:
+                for child in element:
+                    extract_recursive(child, depth + 1)
+            else:
+                text = _node_text(element)
+                if text:
+                    _append_leaf_text(text_elements, text, depth)
+            return
+        
+        if name == 'br':
+            text_elements.append(('pause', '', depth))
+            return
+        
+        for child in element:
+            extract_recursive(child, depth)
+    
+    body = root.find(".//{*}body")
+    extract_recursive(body if body is not None else root)
+    
+    # Se não capturou nada estruturado, usa todo o texto
+    if not text_elements:
+        all_text = " ".join(s.strip() for s in root.itertext() if s.strip())
+        if all_text:
+            text_elements = [('text', all_text, 0)]
+    
+    return title, text_elements
+
+def _soup_text_elements(html: bytes | BinaryIO) -> Tuple[str | None, list]:
+    """Extrai título e elementos de texto com BeautifulSoup (sem lxml)."""
+    soup = BeautifulSoup(html, "html.parser")
     title = _html_title(soup)
     
     # Remove scripts e styles
@@ -134,13 +283,7 @@ def _extract_text(html_bytes: bytes) -> Tuple[str | None, str]:
                     # Elemento folha, pega texto direto
                     text = element.get_text(strip=True)
                     if text:
-                        # Verifica se é subtítulo/data
-                        if _is_subtitle(text):
-                            text_elements.append(('pause', '', depth))
-                            text_elements.append(('subtitle', text, depth))
-                            text_elements.append(('pause', '', depth))
-                        else:
-                            text_elements.append(('text', text, depth))
+                        _append_leaf_text(text_elements, text, depth)
                 return
             
             # Quebras de linha
@@ -156,12 +299,7 @@ def _extract_text(html_bytes: bytes) -> Tuple[str | None, str]:
                 elif hasattr(child, 'string') and child.string and child.string.strip():
                     text = child.string.strip()
                     if text:
-                        if _is_subtitle(text):
-                            text_elements.append(('pause', '', depth))
-                            text_elements.append(('subtitle', text, depth))
-                            text_elements.append(('pause', '', depth))
-                        else:
-                            text_elements.append(('text', text, depth))
+                        _append_leaf_text(text_elements, text, depth)
     
     # Processa o documento inteiro
     extract_recursive(soup.body if soup.body else soup)
@@ -172,7 +310,10 @@ def _extract_text(html_bytes: bytes) -> Tuple[str | None, str]:
         if all_text:
             text_elements = [('text', all_text, 0)]
     
-    # Monta texto final com pausas
+    return title, text_elements
+
+def _join_text_elements(text_elements: list) -> str:
+    """Monta o texto final com pausas, evitando pausas duplas."""
     final_parts = []
     last_type = None
     
@@ -192,135 +333,203 @@ def _extract_text(html_bytes: bytes) -> Tuple[str | None, str]:
     result_text = ' '.join(final_parts)
     
     # Limpeza final
-    result_text = re.sub(r'(\.\.\. \.\.\.){3,}', '... ... ...', result_text)  # Max 3 pausas
-    result_text = re.sub(r'\s+', ' ', result_text)  # Remove espaços múltiplos
-    result_text = result_text.strip()
-    
-    return title, result_text
+    result_text = _repeated_pauses_re.sub('... ... ...', result_text)  # Max 3 pausas
+    result_text = _multiple_space_re.sub(' ', result_text)  # Remove espaços múltiplos
+    return result_text.strip()
+
+_OPF_NS = {
+    "c": "urn:oasis:names:tc:opendocument:xmlns:container",
+    "opf": "http://www.idpf.org/2007/opf",
+    "dc": "http://purl.org/dc/elements/1.1/",
+}
+_DOCUMENT_TYPES = ("application/xhtml+xml", "text/html")
+
+def _read_opf(z: zipfile.ZipFile) -> Tuple[str | None, str | None, Dict[str, Tuple[str, str]], List[str]]:
+    """Lê container.xml e o OPF: título, autor, manifesto {id: (caminho, tipo)} e spine."""
+    container = ET.fromstring(z.read("META-INF/container.xml"))
+    opf_path = container.find(".//c:rootfile", _OPF_NS).get("full-path")
+    opf = ET.fromstring(z.read(opf_path))
+    base = posixpath.dirname(opf_path)
+    
+    title = opf.findtext(".//dc:title", namespaces=_OPF_NS)
+    author = opf.findtext(".//dc:creator", namespaces=_OPF_NS)
+    
+    # Filhos diretos de <manifest>/<spine> ({*}: aceita OPF com ou sem namespace);
+    # o manifesto vira dict para o spine resolver cada idref em O(1)
+    manifest = {}
+    for item in opf.iterfind("{*}manifest/{*}item"):
+        href = posixpath.normpath(posixpath.join(base, unquote(item.get("href", ""))))
+        manifest[item.get("id")] = (href, item.get("media-type", ""))
+    
+    spine = [ref.get("idref") for ref in opf.iterfind("{*}spine/{*}itemref")]
+    return title, author, manifest, spine
 
 def read_epub(epub_path: Path) -> Tuple[str, str | None, List[Tuple[str, str]]]:
-    """Lê EPUB e extrai metadados e capítulos."""
+    """Lê EPUB e extrai metadados e capítulos.
+    
+    O ZIP é lido direto: cada capítulo é descomprimido e parseado sob demanda,
+    sem carregar o livro inteiro na memória de uma vez.
+    """
     print(f"[INFO] Lendo arquivo '{epub_path.name}' com extensão '{epub_path.suffix}'")
     
     try:
-        book = epub.read_epub(str(epub_path))
-    except Exception as e:
+        z = zipfile.ZipFile(epub_path)
+    except zipfile.BadZipFile as e:
         raise RuntimeError(f"Erro ao ler EPUB: {e}")
     
-    # Metadados
-    md_title = None
-    md_author = None
-    
-    titles = book.get_metadata('DC', 'title')
-    if titles:
-        md_title = titles[0][0]
+    try:
+        md_title, md_author, manifest, spine = _read_opf(z)
+    except (KeyError, AttributeError, ET.ParseError) as e:
+        z.close()
+        raise RuntimeError(f"Erro ao ler EPUB: {e}")
     
-    creators = book.get_metadata('DC', 'creator')
-    if creators:
-        md_author = creators[0][0]
+    def _read_chapter(href: str) -> Tuple[str | None, str]:
+        try:
+            with z.open(href) as f:
+                return _extract_text(f)
+        except KeyError:
+            return None, ""
     
     chapters: List[Tuple[str, str]] = []
     
-    # Primeira tentativa: usar spine (ordem correta)
-    for idx, (idref, _) in enumerate(book.spine, start=1):
-        item = book.get_item_with_id(idref)
-        if item and item.get_type() == ebooklib.ITEM_DOCUMENT:
-            title, text = _extract_text(item.get_content())
-            if text and len(text.strip()) > 50:
-                ch_title = title or f"Capítulo {idx}"
-                chapters.append((ch_title, text))
-    
-    # Fallback: se não achou capítulos via spine
-    if not chapters:
-        print("[AVISO] Não encontrou capítulos via spine, tentando todos os documentos...")
-        for item in book.get_items_of_type(ebooklib.ITEM_DOCUMENT):
-            title, text = _extract_text(item.get_content())
-            if text and len(text.strip()) > 50:
-                ch_title = title or f"Capítulo {len(chapters)+1}"
-                chapters.append((ch_title, text))
+    with z:
+        # Primeira tentativa: usar spine (ordem correta)
+        for idx, idref in enumerate(spine, start=1):
+            href, media_type = manifest.get(idref, (None, None))
+            if href and media_type in _DOCUMENT_TYPES:
+                title, text = _read_chapter(href)
+                if text and len(text.strip()) > 50:
+                    ch_title = title or f"Capítulo {idx}"
+                    chapters.append((ch_title, text))
+        
+        # Fallback: se não achou capítulos via spine
+        if not chapters:
+            print("[AVISO] Não encontrou capítulos via spine, tentando todos os documentos...")
+            for href, media_type in manifest.values():
+                if media_type in _DOCUMENT_TYPES:
+                    title, text = _read_chapter(href)
+                    if text and len(text.strip()) > 50:
+                        ch_title = title or f"Capítulo {len(chapters)+1}"
+                        chapters.append((ch_title, text))
     
     return md_title or epub_path.stem, md_author, chapters
 
 # ========== SISTEMA DE CACHE ==========
 
-def create_cache_structure(book_title: str, chapters: List[Tuple[str, str]]) -> Path:
-    """Cria/atualiza estrutura de cache com textos separados."""
-    cache_dir = Path(".cache") / sanitize_filename(book_title)
+def _json_loads(data: bytes):
+    """Decodifica JSON com orjson quando disponível."""
+    return orjson.loads(data) if orjson else json.loads(data)
+
+def _json_dumps(obj) -> bytes:
+    """Codifica JSON indentado (UTF-8, sem escapar acentos)."""
+    if orjson:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+
+def _epub_stamp(epub_path: Path) -> List[float]:
+    """Identifica a versão do EPUB (mtime + tamanho) para invalidar o cache."""
+    st = epub_path.stat()
+    return [st.st_mtime, st.st_size]
+
+def _write_if_changed(path: Path, data: bytes) -> bool:
+    """Grava `data` só se difere do conteúdo atual; retorna se gravou (atômico via rename)."""
+    try:
+        if path.stat().st_size == len(data) and path.read_bytes() == data:
+            return False
+    except OSError:
+        pass
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+    return True
+
+def create_cache_structure(book_title: str, chapters: List[Tuple[str, str]],
+                           epub_path: Path | None = None, author: str | None = None) -> Path:
+    """Cria/atualiza o cache: chapters.pkl (autoritativo) + metadata.json legível.
+    
+    Com `epub_path`, o diretório usa o nome do arquivo (mesma chave consultada
+    por check_existing_cache antes de abrir o EPUB).
+    """
+    cache_key = epub_path.stem if epub_path else book_title
+    cache_dir = Path(".cache") / sanitize_filename(cache_key)
     cache_dir.mkdir(parents=True, exist_ok=True)
     
+    stamp = _epub_stamp(epub_path) if epub_path else None
+    
     # Salva metadados
     metadata = {
         "title": book_title,
+        "author": author,
         "total_chapters": len(chapters),
-        "chapters": [],
+        "chapters": [
+            {
+                "index": idx,
+                "title": title,
+                "char_count": len(text),
+                # Identifica o conteúdo: capítulos inalterados mantêm o hash entre execuções
+                "hash": hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+            }
+            for idx, (title, text) in enumerate(chapters, start=1)
+        ],
         "created_at": str(Path.cwd()),
-        "epub_processed": True
+        "epub_processed": True,
+        "epub_stamp": stamp
     }
     
-    # Remove arquivos antigos se existirem
-    for old_file in cache_dir.glob("*.txt"):
-        try:
-            old_file.unlink()
-        except:
-            pass
-    
-    # Salva cada capítulo como .txt
-    for idx, (title, text) in enumerate(chapters, start=1):
-        index_str = zero_pad(idx, len(chapters))
-        safe_title = sanitize_filename(title)
-        txt_name = f"{index_str} - {safe_title}.txt"
-        txt_path = cache_dir / txt_name
-        
-        # Salva texto do capítulo
-        with open(txt_path, 'w', encoding='utf-8') as f:
-            f.write(text)
-        
-        metadata["chapters"].append({
-            "index": idx,
-            "title": title,
-            "txt_file": txt_name,
-            "char_count": len(text)
-        })
+    # Remove .txt por capítulo de caches antigos (só existem antes do blob)
+    if not (cache_dir / "chapters.pkl").exists():
+        for old_file in cache_dir.glob("*.txt"):
+            try:
+                old_file.unlink()
+            except:
+                pass
     
+    # Todos os capítulos num único arquivo: uma leitura para carregar
+    written = _write_if_changed(cache_dir / "chapters.pkl", pickle.dumps(chapters, protocol=5))
     # Salva metadados
-    with open(cache_dir / "metadata.json", 'w', encoding='utf-8') as f:
-        json.dump(metadata, f, indent=2, ensure_ascii=False)
+    written |= _write_if_changed(cache_dir / "metadata.json", _json_dumps(metadata))
     
-    print(f"📁 Cache atualizado: {cache_dir} ({len(chapters)} capítulos)")
+    if written:
+        print(f"📁 Cache atualizado: {cache_dir} ({len(chapters)} capítulos)")
+    else:
+        print(f"📁 Cache inalterado: {cache_dir} ({len(chapters)} capítulos)")
     return cache_dir
 
 def load_from_cache(cache_dir: Path) -> Tuple[Dict, List[Tuple[str, str]]]:
     """Carrega capítulos do cache."""
     metadata_file = cache_dir / "metadata.json"
+    chapters_file = cache_dir / "chapters.pkl"
     if not metadata_file.exists():
         raise FileNotFoundError("Cache metadata não encontrado")
+    if not chapters_file.exists():
+        raise FileNotFoundError("Cache de capítulos não encontrado")
     
-    with open(metadata_file, 'r', encoding='utf-8') as f:
-        metadata = json.load(f)
+    metadata = _json_loads(metadata_file.read_bytes())
     
-    chapters = []
-    missing_files = []
-    
-    for ch_meta in metadata["chapters"]:
-        txt_path = cache_dir / ch_meta["txt_file"]
-        if txt_path.exists():
-            with open(txt_path, 'r', encoding='utf-8') as f:
-                text = f.read()
-            chapters.append((ch_meta["title"], text))
-        else:
-            missing_files.append(ch_meta["txt_file"])
-    
-    if missing_files:
-        raise FileNotFoundError(f"Arquivos de cache em falta: {missing_files}")
+    chapters = pickle.loads(chapters_file.read_bytes())
     
     return metadata, chapters
 
-def check_existing_cache(book_title: str) -> Path | None:
-    """Verifica se já existe cache para o livro."""
+def check_existing_cache(book_title: str, epub_path: Path | None = None) -> Path | None:
+    """Verifica se já existe cache válido para o livro.
+    
+    Com `epub_path`, o cache só vale se o mtime/tamanho gravados coincidem com
+    o arquivo atual; um EPUB alterado é reprocessado automaticamente.
+    """
     cache_dir = Path(".cache") / sanitize_filename(book_title)
-    if cache_dir.exists() and (cache_dir / "metadata.json").exists():
-        return cache_dir
-    return None
+    metadata_file = cache_dir / "metadata.json"
+    if not (metadata_file.exists() and (cache_dir / "chapters.pkl").exists()):
+        return None
+    
+    if epub_path is not None:
+        try:
+            stamp = _json_loads(metadata_file.read_bytes()).get("epub_stamp")
+        except (OSError, ValueError):
+            return None
+        if stamp != _epub_stamp(epub_path):
+            return None
+    
+    return cache_dir
 
 # ========== PREVIEW DE VOZES ==========
 
@@ -353,14 +562,14 @@ async def preview_edge_voice(voice: str) -> None:
 
 def preview_coqui_voice(model_name: str) -> None:
     """Gera preview da voz do Coqui TTS."""
-    if not TTS:
+    if not COQUI_AVAILABLE:
         return
     
     preview_text = "Esta é uma demonstração da voz Coqui selecionada."
     preview_file = Path(".preview-coqui.wav")
     
     try:
-        tts = CoquiTTS(model_name=model_name)
+        tts = _get_coqui(model_name)
         tts.tts_to_file(text=preview_text, file_path=str(preview_file))
         
         # Tenta reproduzir
@@ -377,303 +586,451 @@ def preview_coqui_voice(model_name: str) -> None:
     except Exception as e:
         print(f"❌ Erro ao gerar preview Coqui: {e}")
 
+def _split_spans(text: str, start: int, end: int, max_chars: int, level: int = 0):
+    """Gera intervalos (início, fim) contíguos de text[start:end] com até max_chars.
+    
+    Quebra primeiro nas pausas longas, depois em parágrafos, depois em frases
+    e, em último caso, no último espaço antes do limite.
+    """
+    if end - start <= max_chars:
+        yield start, end
+        return
+    
+    if level < 3:
+        pattern = (_section_re, _paragraph_re, _sentence_re)[level]
+        pos = start
+        for m in pattern.finditer(text, start, end):
+            if pos < m.end() < end:
+                yield from _split_spans(text, pos, m.end(), max_chars, level + 1)
+                pos = m.end()
+        yield from _split_spans(text, pos, end, max_chars, level + 1)
+        return
+    
+    # Frase sem pontuação maior que o limite: corta no último espaço
+    while end - start > max_chars:
+        cut = text.rfind(" ", start + 1, start + max_chars)
+        if cut == -1:
+            cut = start + max_chars
+        yield start, cut
+        start = cut
+    yield start, end
+
 def chunk_text(text: str, max_chars: int = 1500) -> List[str]:
-    """Divide texto em chunks menores respeitando pontuação e pausas naturais."""
+    """Divide texto em chunks menores respeitando pontuação e pausas naturais.
+    
+    Varre o texto uma única vez empacotando intervalos contíguos, sem
+    concatenar strings; cada chunk é uma fatia do texto original.
+    """
     if len(text) <= max_chars:
         return [text]
     
     chunks = []
+    chunk_start = chunk_end = 0
     
-    # Primeiro divide por pausas longas (títulos/subtítulos)
-    major_sections = re.split(r'(\.\.\. \.\.\.)', text)
-    current_chunk = ""
+    for span_start, span_end in _split_spans(text, 0, len(text), max_chars):
+        if span_end - chunk_start > max_chars and chunk_end > chunk_start:
+            chunks.append((chunk_start, chunk_end))
+            chunk_start = span_start
+        chunk_end = span_end
+    chunks.append((chunk_start, chunk_end))
     
-    for section in major_sections:
-        if section == "... ...":
-            # Preserva pausas nos chunks
-            if current_chunk:
-                current_chunk += " " + section
-            continue
-            
-        section = section.strip()
-        if not section:
-            continue
-        
-        # Se seção cabe no chunk atual
-        if len(current_chunk) + len(section) + 10 <= max_chars:
-            if current_chunk:
-                current_chunk += " " + section
-            else:
-                current_chunk = section
-        else:
-            # Salva chunk atual se não vazio
-            if current_chunk:
-                chunks.append(current_chunk.strip())
-                current_chunk = ""
-            
-            # Se seção é maior que limite, divide por parágrafos
-            if len(section) > max_chars:
-                paragraphs = section.split('\n\n')
-                temp_chunk = ""
-                
-                for paragraph in paragraphs:
-                    paragraph = paragraph.strip()
-                    if not paragraph:
-                        continue
-                        
-                    if len(temp_chunk) + len(paragraph) + 2 <= max_chars:
-                        if temp_chunk:
-                            temp_chunk += "\n\n" + paragraph
-                        else:
-                            temp_chunk = paragraph
-                    else:
-                        if temp_chunk:
-                            chunks.append(temp_chunk)
-                        
-                        # Se parágrafo ainda é muito grande, divide por frases
-                        if len(paragraph) > max_chars:
-                            sentences = re.split(r'[.!?]+', paragraph)
-                            sent_chunk = ""
-                            
-                            for sentence in sentences:
-                                sentence = sentence.strip()
-                                if not sentence:
-                                    continue
-                                    
-                                if len(sent_chunk) + len(sentence) + 2 <= max_chars:
-                                    if sent_chunk:
-                                        sent_chunk += ". " + sentence
-                                    else:
-                                        sent_chunk = sentence
-                                else:
-                                    if sent_chunk:
-                                        chunks.append(sent_chunk + ".")
-                                    sent_chunk = sentence
-                            
-                            if sent_chunk:
-                                temp_chunk = sent_chunk + "."
-                            else:
-                                temp_chunk = ""
-                        else:
-                            temp_chunk = paragraph
-                
-                if temp_chunk:
-                    current_chunk = temp_chunk
-            else:
-                current_chunk = section
-    
-    if current_chunk:
-        chunks.append(current_chunk.strip())
-    
-    return [chunk for chunk in chunks if chunk.strip()]
+    return [chunk for chunk in (text[s:e].strip() for s, e in chunks) if chunk]
 
 # ========== ENGINES TTS ==========
 
+# Tamanho máximo de cada requisição por engine (Piper recebe o capítulo inteiro)
+ENGINE_CHUNK_CHARS = {"edge": 8000, "coqui": 1500}
+
+def chunk_chapter(text: str, engine: str) -> List[str]:
+    """Divide o capítulo no tamanho de requisição do engine (uma única vez)."""
+    max_chars = ENGINE_CHUNK_CHARS.get(engine)
+    if max_chars is None or len(text) <= max_chars:
+        return [text]
+    return chunk_text(text, max_chars=max_chars)
+
 async def synthesize_with_edge_tts(text: str, voice: str, output_path: Path, 
-                                  bitrate: str = "32k", ar: int = 22050, ac: int = 1) -> None:
-    """Sintetiza texto usando Edge-TTS e converte para MP3 comprimido."""
+                                  bitrate: str = "32k", ar: int = 22050, ac: int = 1,
+                                  concurrency: int = 4,
+                                  semaphore: asyncio.Semaphore | None = None,
+                                  chunks: List[str] | None = None) -> int | None:
+    """Sintetiza texto usando Edge-TTS e converte para MP3 comprimido.
+    
+    Chunks múltiplos são sintetizados em paralelo, limitados por `concurrency`
+    requisições simultâneas para não esbarrar no throttle da Microsoft.
+    Um `semaphore` recebido substitui esse limite (compartilhado entre capítulos);
+    `chunks` já divididos por chunk_chapter evitam dividir o texto de novo.
+    Se bitrate/ar/ac coincidem com um formato de EDGE_OUTPUT_FORMATS, o MP3
+    do Edge é gravado como está, sem segunda passada de encode, e o total de
+    bytes gravados é retornado (None quando o ffmpeg grava o arquivo).
+    """
     if not edge_tts:
         raise RuntimeError("Edge-TTS não instalado. Execute: pip install edge-tts")
     
-    chunks = chunk_text(text, max_chars=8000)
-    
-    if len(chunks) == 1:
-        # Para chunk único, gera direto e converte
-        temp_raw = output_path.with_suffix('.tmp.mp3')
+    if chunks is None:
+        chunks = chunk_chapter(text, "edge")
+    native = (bitrate, ar, ac) in EDGE_OUTPUT_FORMATS.values()
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+    
+    if native:
+        # Alvo igual ao stream do Edge: grava os frames MP3 em sequência
+        # (MP3 ressincroniza por frame, então concatenar bytes é válido)
+        async def _fetch(chunk: str) -> bytes:
+            async with semaphore:
+                return await _edge_stream_bytes(chunk, voice)
+        
+        tasks = [asyncio.create_task(_fetch(chunk)) for chunk in chunks]
+        written = 0
         try:
-            communicate = edge_tts.Communicate(text, voice)
-            await communicate.save(str(temp_raw))
+            with open(output_path, 'wb') as f:
+                for task in tasks:
+                    written += f.write(await task)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            if output_path.exists():
+                output_path.unlink()
+            raise
+        return written
+    
+    # Um único ffmpeg por capítulo, alimentado via stdin na ordem dos chunks
+    proc = await asyncio.create_subprocess_exec(
+        "ffmpeg", "-y",
+        "-f", "mp3",
+        "-i", "pipe:0",
+        "-ar", str(ar),
+        "-ac", str(ac),
+        "-b:a", bitrate,
+        "-loglevel", "error",
+        str(output_path),
+        stdin=subprocess.PIPE,
+        stderr=subprocess.PIPE
+    )
+    tasks = []
+    
+    try:
+        if len(chunks) == 1:
+            # Chunk único: repassa o áudio ao ffmpeg conforme chega da rede
+            async with semaphore:
+                communicate = edge_tts.Communicate(text, voice)
+                async for message in communicate.stream():
+                    if message["type"] == "audio":
+                        proc.stdin.write(message["data"])
+                        await proc.stdin.drain()
+        else:
+            # Múltiplos chunks: sintetiza em paralelo (I/O de rede)
+            async def _synthesize_one(chunk: str) -> bytes:
+                async with semaphore:
+                    return await _edge_stream_bytes(chunk, voice)
             
-            # Converte para MP3 comprimido
-            cmd = [
-                "ffmpeg", "-y",
-                "-i", str(temp_raw),
-                "-ar", str(ar),
-                "-ac", str(ac),
-                "-b:a", bitrate,
-                "-loglevel", "error",
-                str(output_path)
-            ]
-            result = subprocess.run(cmd, capture_output=True, timeout=120)
-            if result.returncode != 0:
-                raise RuntimeError(f"Erro na conversão: {result.stderr.decode()}")
-                
-        finally:
-            if temp_raw.exists():
-                temp_raw.unlink()
-    else:
-        # Para múltiplos chunks
-        temp_files = []
+            tasks = [asyncio.create_task(_synthesize_one(chunk)) for chunk in chunks]
+            for task in tasks:
+                proc.stdin.write(await task)
+                await proc.stdin.drain()
+        proc.stdin.close()
+        
+        stderr = await proc.stderr.read()
+        if await proc.wait() != 0:
+            raise RuntimeError(f"Erro na conversão: {stderr.decode()}")
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        if proc.returncode is None:
+            proc.kill()
+            await proc.wait()
+        # Não deixa MP3 parcial que seria tomado como capítulo pronto
+        if output_path.exists():
+            output_path.unlink()
+        raise
+
+async def _edge_stream_bytes(text: str, voice: str) -> bytes:
+    """Recebe o áudio MP3 do Edge-TTS direto em memória, sem arquivo temporário."""
+    communicate = edge_tts.Communicate(text, voice)
+    audio = bytearray()
+    async for message in communicate.stream():
+        if message["type"] == "audio":
+            audio.extend(message["data"])
+    return bytes(audio)
+
+def resolve_device(device: str, engine: str) -> str:
+    """Resolve --device auto para 'cuda' ou 'cpu' conforme o engine.
+    
+    No Piper, auto é sempre cpu: o binário piper pode não ter sido compilado
+    com GPU mesmo que o onnxruntime do Python tenha CUDA; --cuda só com --device cuda.
+    """
+    if device != "auto":
+        return device
+    
+    if engine == "coqui":
         try:
-            # Gera chunks individuais
-            for i, chunk in enumerate(chunks):
-                temp_raw = output_path.parent / f".tmp-edge-raw-{i}.mp3"
-                temp_compressed = output_path.parent / f".tmp-edge-{i}.mp3"
-                
-                # Gera áudio bruto
-                communicate = edge_tts.Communicate(chunk, voice)
-                await communicate.save(str(temp_raw))
-                
-                # Comprime chunk
-                cmd = [
-                    "ffmpeg", "-y",
-                    "-i", str(temp_raw),
-                    "-ar", str(ar),
-                    "-ac", str(ac),
-                    "-b:a", bitrate,
-                    "-loglevel", "error",
-                    str(temp_compressed)
-                ]
-                subprocess.run(cmd, capture_output=True, check=True)
-                
-                temp_files.append(temp_compressed)
-                
-                # Remove arquivo bruto
-                if temp_raw.exists():
-                    temp_raw.unlink()
-            
-            # Junta chunks comprimidos
-            if len(temp_files) > 1:
-                concat_list = output_path.parent / ".tmp-edge-concat.txt"
-                with open(concat_list, 'w') as f:
-                    for temp_file in temp_files:
-                        f.write(f"file '{temp_file.name}'\n")
-                
-                cmd = ["ffmpeg", "-y", "-f", "concat", "-safe", "0", "-i", str(concat_list), "-c", "copy", str(output_path)]
-                subprocess.run(cmd, capture_output=True, check=True)
-                
-                if concat_list.exists():
-                    concat_list.unlink()
-            else:
-                temp_files[0].rename(output_path)
-                temp_files = []
-                
-        finally:
-            # Limpa arquivos temporários
-            for temp_file in temp_files:
-                if temp_file.exists():
-                    temp_file.unlink()
-            # Limpa possíveis arquivos brutos restantes
-            for temp_raw in output_path.parent.glob(".tmp-edge-raw-*.mp3"):
-                try:
-                    temp_raw.unlink()
-                except:
-                    pass
+            import torch
+            return "cuda" if torch.cuda.is_available() else "cpu"
+        except ImportError:
+            pass
+    return "cpu"
 
-def synthesize_with_coqui(text: str, model_name: str, output_path: Path) -> None:
-    """Sintetiza texto usando Coqui TTS local (100% privado)."""
-    if not TTS:
-        raise RuntimeError("Coqui TTS não instalado. Execute: pip install TTS")
+@functools.lru_cache(maxsize=2)
+def _get_coqui(model_name: str, gpu: bool = False, int8: bool = False):
+    """Carrega o modelo Coqui uma única vez por processo e reutiliza entre capítulos."""
+    from TTS.api import TTS as CoquiTTS
     
-    chunks = chunk_text(text, max_chars=1500)
+    tts = CoquiTTS(model_name=model_name, gpu=gpu)
+    if int8:
+        # INT8 na CPU: quantização dinâmica das camadas lineares (pesos 4x menores)
+        import torch
+        torch.quantization.quantize_dynamic(
+            tts.synthesizer.tts_model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True
+        )
+    return tts
+
+def resolve_piper_model(model_path: Path, precision: str) -> Path:
+    """Retorna o modelo Piper na precisão pedida, quantizando para int8 na primeira vez."""
+    if precision != "int8" or model_path.name.endswith(".int8.onnx"):
+        return model_path
     
-    if len(chunks) == 1:
+    quantized = model_path.with_name(f"{model_path.stem}.int8.onnx")
+    if not quantized.exists():
         try:
-            tts = CoquiTTS(model_name=model_name)
-            wav_tmp = output_path.with_suffix('.wav')
-            tts.tts_to_file(text=text, file_path=str(wav_tmp))
-            convert_wav_to_mp3(wav_tmp, output_path)
-        finally:
-            if wav_tmp.exists():
-                wav_tmp.unlink()
+            from onnxruntime.quantization import quantize_dynamic, QuantType
+        except ImportError:
+            print("⚠️  onnxruntime não instalado, usando modelo fp32")
+            return model_path
+        print(f"🔧 Quantizando {model_path.name} para int8 (apenas na primeira vez)...")
+        quantize_dynamic(str(model_path), str(quantized), weight_type=QuantType.QInt8)
+    
+    # Piper procura a configuração em <modelo>.onnx.json
+    config = model_path.with_name(model_path.name + ".json")
+    quantized_config = quantized.with_name(quantized.name + ".json")
+    if config.exists() and not quantized_config.exists():
+        shutil.copyfile(config, quantized_config)
+    
+    return quantized
+
+def synthesize_with_coqui(text: str, model_name: str, output_path: Path,
+                          gpu: bool = False, half: bool = False,
+                          int8: bool = False,
+                          chunks: List[str] | None = None) -> None:
+    """Sintetiza texto usando Coqui TTS local (100% privado).
+    
+    Cada chunk vai para o stdin do ffmpeg assim que sai do modelo: a codificação
+    MP3 (CPU, outro processo) corre enquanto o próximo chunk é sintetizado,
+    e nenhum WAV temporário vai para o disco.
+    """
+    if not COQUI_AVAILABLE:
+        raise RuntimeError("Coqui TTS não instalado. Execute: pip install TTS")
+    
+    import numpy as np
+    
+    if chunks is None:
+        chunks = chunk_chapter(text, "coqui")
+    tts = _get_coqui(model_name, gpu, int8)
+    
+    # FP16 na GPU via autocast: os pesos continuam fp32 e cada operação converte
+    # as entradas (texto, mels de condicionamento do speaker_wav) por conta própria;
+    # um .half() no modelo deixaria essas entradas em fp32 e quebraria a inferência
+    if half:
+        import torch
+        precision_ctx = functools.partial(torch.autocast, "cuda", dtype=torch.float16)
     else:
-        temp_files = []
-        try:
-            tts = CoquiTTS(model_name=model_name)
-            
-            for i, chunk in enumerate(chunks):
-                temp_wav = output_path.parent / f".tmp-coqui-{i}.wav"
-                temp_mp3 = output_path.parent / f".tmp-coqui-{i}.mp3"
-                
-                tts.tts_to_file(text=chunk, file_path=str(temp_wav))
-                convert_wav_to_mp3(temp_wav, temp_mp3)
-                temp_files.append(temp_mp3)
-                
-                if temp_wav.exists():
-                    temp_wav.unlink()
-            
-            if len(temp_files) > 1:
-                concat_list = output_path.parent / ".tmp-coqui-concat.txt"
-                with open(concat_list, 'w') as f:
-                    for temp_file in temp_files:
-                        f.write(f"file '{temp_file.name}'\n")
-                
-                cmd = ["ffmpeg", "-y", "-f", "concat", "-safe", "0", "-i", str(concat_list), "-c", "copy", str(output_path)]
-                subprocess.run(cmd, capture_output=True, check=True)
-                
-                if concat_list.exists():
-                    concat_list.unlink()
-            else:
-                temp_files[0].rename(output_path)
-                temp_files = []
-                
-        finally:
-            for temp_file in temp_files:
-                if temp_file.exists():
-                    temp_file.unlink()
+        precision_ctx = contextlib.nullcontext
+    
+    proc = subprocess.Popen(
+        _pcm_to_mp3_cmd("f32le", tts.synthesizer.output_sample_rate, output_path),
+        stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE
+    )
+    try:
+        for chunk in chunks:
+            with precision_ctx():
+                wav = tts.tts(text=chunk)
+            proc.stdin.write(np.asarray(wav, dtype=np.float32).tobytes())
+    except BrokenPipeError:
+        pass  # ffmpeg morreu: o erro dele é reportado abaixo
+    except BaseException:
+        proc.kill()
+        proc.wait()
+        output_path.unlink(missing_ok=True)
+        raise
+    _finish_mp3_encode(proc, output_path)
 
-def synthesize_with_piper(text: str, model_path: Path, output_path: Path) -> None:
-    """Sintetiza texto usando Piper CLI (100% local)."""
-    wav_tmp = output_path.with_suffix('.wav')
+def _piper_sample_rate(model_path: Path) -> int:
+    """Taxa de amostragem do modelo Piper (lida de <modelo>.onnx.json)."""
+    try:
+        config = _json_loads(model_path.with_name(model_path.name + ".json").read_bytes())
+        return int(config["audio"]["sample_rate"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return 22050
+
+def synthesize_with_piper(text: str, model_path: Path, output_path: Path, cuda: bool = False) -> None:
+    """Sintetiza texto usando Piper CLI (100% local).
+    
+    O PCM bruto do Piper (--output_raw) vai direto para o stdin do ffmpeg,
+    sem WAV temporário no disco.
+    """
+    encoder = subprocess.Popen(
+        _pcm_to_mp3_cmd("s16le", _piper_sample_rate(model_path), output_path),
+        stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE
+    )
     
     cmd = [
         "piper",
         "--model", str(model_path),
-        "--output_file", str(wav_tmp)
+        "--output_raw"
     ]
+    if cuda:
+        cmd.append("--cuda")
     
     try:
-        result = subprocess.run(
-            cmd, 
-            input=text, 
-            text=True, 
-            capture_output=True, 
-            timeout=300
-        )
-        
-        if result.returncode != 0:
-            raise RuntimeError(f"Piper falhou: {result.stderr}")
-            
-        convert_wav_to_mp3(wav_tmp, output_path)
-        
-    finally:
-        if wav_tmp.exists():
-            wav_tmp.unlink()
+        piper = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=encoder.stdin, stderr=subprocess.PIPE)
+        _, stderr = piper.communicate(input=text.encode('utf-8'), timeout=300)
+    except subprocess.TimeoutExpired:
+        piper.kill()
+        _, stderr = piper.communicate()
+        stderr = "Timeout na síntese\n".encode() + stderr
+    except OSError as e:
+        encoder.kill()
+        encoder.wait()
+        raise RuntimeError(f"Piper falhou: {e}")
+    
+    if piper.returncode != 0:
+        encoder.kill()
+        encoder.wait()
+        output_path.unlink(missing_ok=True)
+        raise RuntimeError(f"Piper falhou: {stderr.decode(errors='replace')}")
+    
+    _finish_mp3_encode(encoder, output_path)
 
-def convert_wav_to_mp3(wav_path: Path, mp3_path: Path, ar: int = 22050, ac: int = 1, bitrate: str = "32k") -> None:
-    """Converte WAV para MP3 usando ffmpeg."""
-    cmd = [
+def _pcm_to_mp3_cmd(sample_format: str, sample_rate: int, mp3_path: Path,
+                    ar: int = 22050, ac: int = 1, bitrate: str = "32k") -> List[str]:
+    """Comando ffmpeg que lê PCM mono bruto do stdin e grava o MP3."""
+    return [
         "ffmpeg", "-y",
-        "-i", str(wav_path),
+        "-f", sample_format, "-ar", str(sample_rate), "-ac", "1",
+        "-i", "pipe:0",
         "-ar", str(ar),
         "-ac", str(ac),
         "-b:a", bitrate,
         "-loglevel", "error",
         str(mp3_path),
     ]
-    
+
+def _finish_mp3_encode(proc: subprocess.Popen, mp3_path: Path, pcm: bytes | None = None) -> None:
+    """Entrega o PCM restante ao ffmpeg e aguarda o MP3; remove o arquivo parcial em erro."""
     try:
-        result = subprocess.run(cmd, capture_output=True, timeout=120)
-        if result.returncode != 0:
-            raise RuntimeError(f"ffmpeg falhou: {result.stderr.decode()}")
+        _, stderr = proc.communicate(input=pcm, timeout=120)
     except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+        mp3_path.unlink(missing_ok=True)
         raise RuntimeError("Timeout na conversão MP3")
+    
+    if proc.returncode != 0:
+        mp3_path.unlink(missing_ok=True)
+        raise RuntimeError(f"ffmpeg falhou: {stderr.decode(errors='replace')}")
 
-def synthesize_chapter(text: str, engine: str, output_path: Path, **kwargs) -> None:
-    """Sintetiza um capítulo usando o engine especificado."""
+def synthesize_chapter(text: str, engine: str, output_path: Path,
+                       chunks: List[str] | None = None, **kwargs) -> int | None:
+    """Sintetiza um capítulo (`chunks` de chunk_chapter); retorna os bytes gravados se conhecidos."""
     
     if engine == "edge":
         # Passa parâmetros de compressão para Edge-TTS
         bitrate = kwargs.get('bitrate', '32k')
         ar = kwargs.get('ar', 22050)
         ac = kwargs.get('ac', 1)
-        asyncio.run(synthesize_with_edge_tts(text, kwargs['voice'], output_path, bitrate, ar, ac))
+        concurrency = kwargs.get('concurrency', 4)
+        return asyncio.run(synthesize_with_edge_tts(text, kwargs['voice'], output_path, bitrate, ar, ac,
+                                                    concurrency, chunks=chunks))
     elif engine == "coqui":
-        synthesize_with_coqui(text, kwargs['model_name'], output_path)
+        synthesize_with_coqui(text, kwargs['model_name'], output_path,
+                              gpu=kwargs.get('device') == "cuda",
+                              half=kwargs.get('precision') == "fp16",
+                              int8=kwargs.get('precision') == "int8", chunks=chunks)
     elif engine == "piper":
-        synthesize_with_piper(text, kwargs['model_path'], output_path)
+        synthesize_with_piper(text, kwargs['model_path'], output_path,
+                              cuda=kwargs.get('device') == "cuda")
     else:
         raise ValueError(f"Engine não suportado: {engine}")
+    return None
+
+def _synth_one(job: Tuple[str, str, Path, Dict, List[str]]) -> Tuple[str | None, int | None]:
+    """Sintetiza um capítulo num worker do pool; retorna (erro ou None, bytes gravados)."""
+    text, engine, output_path, engine_kwargs, chunks = job
+    try:
+        return None, synthesize_chapter(text, engine, output_path, chunks, **engine_kwargs)
+    except Exception as e:
+        return str(e), None
+
+async def _synthesize_edge_book(pending: List[Tuple[str, str, str, List[str], Path]], engine_kwargs: Dict,
+                                max_chapters: int, total: int, progress=None) -> int:
+    """Sintetiza vários capítulos Edge-TTS num único event loop; retorna os sucessos.
+    
+    Todas as requisições do livro dividem um só semáforo (--edge-concurrency),
+    então o throttle da Microsoft é respeitado no livro inteiro; `max_chapters`
+    limita quantos capítulos (e processos ffmpeg) ficam abertos ao mesmo tempo.
+    """
+    requests_sem = asyncio.Semaphore(max(1, engine_kwargs.get('concurrency', 4)))
+    chapters_sem = asyncio.Semaphore(max(1, max_chapters))
+    
+    async def _one(text: str, chunks: List[str], output_path: Path) -> Tuple[str | None, int | None]:
+        async with chapters_sem:
+            try:
+                return None, await synthesize_with_edge_tts(
+                    text, engine_kwargs['voice'], output_path,
+                    engine_kwargs.get('bitrate', '32k'), engine_kwargs.get('ar', 22050),
+                    engine_kwargs.get('ac', 1), semaphore=requests_sem, chunks=chunks
+                )
+            except Exception as e:
+                return str(e), None
+    
+    tasks = [asyncio.create_task(_one(text, chunks, mp3_path)) for _, _, text, chunks, mp3_path in pending]
+    success_count = 0
+    
+    # Resultados mostrados na ordem dos capítulos
+    for (index_str, title, text, chunks, mp3_path), task in zip(pending, tasks):
+        error, size = await task
+        _print_chapter_start(index_str, total, title, text, len(chunks))
+        if _print_chapter_result(mp3_path, text, error, progress, size):
+            success_count += 1
+    
+    return success_count
+
+def _write(message: str) -> None:
+    """Escreve no console numa só chamada, sem quebrar a barra de progresso."""
+    if tqdm:
+        tqdm.write(message)
+    else:
+        print(message)
+
+def _progress_bar(total: int):
+    """Barra de progresso dos capítulos (None sem tqdm; desligada fora de terminal)."""
+    if not tqdm:
+        return None
+    return tqdm(total=total, unit="cap", disable=None, leave=False)
+
+def _print_chapter_start(index_str: str, total: int, title: str, text: str, chunk_count: int) -> None:
+    """Mostra cabeçalho do capítulo sendo convertido."""
+    parts = f" | {chunk_count} partes" if chunk_count > 1 else ""
+    _write(f"🎙️  [{index_str}/{total}] '{title[:50]}{'...' if len(title) > 50 else ''}\n"
+           f"    📝 {len(text)} caracteres{parts}")
+
+def _print_chapter_result(mp3_path: Path, text: str, error: str | None, progress=None,
+                          size: int | None = None) -> bool:
+    """Mostra resultado da conversão de um capítulo; retorna True em caso de sucesso.
+    
+    `size` (bytes gravados, quando o engine sabe) evita um stat no MP3.
+    """
+    if progress is not None:
+        progress.update(1)
+    
+    if error is not None:
+        _write(f"    ❌ ERRO: {error}\n")
+        return False
+    
+    if size is None:
+        size = mp3_path.stat().st_size
+    file_size = size / 1024 / 1024  # MB
+    duration_est = len(text) / 1000 * 0.6  # Estimativa: ~0.6 min por 1000 chars
+    _write(f"    ✅ Criado: {mp3_path.name} ({file_size:.1f}MB, ~{duration_est:.1f}min)\n")
+    return True
 
 # ========== SELEÇÃO DE VOZES/MODELOS ==========
 
@@ -698,7 +1055,7 @@ def show_menu() -> str:
     print()
     
     # Verifica Coqui
-    if TTS:
+    if COQUI_AVAILABLE:
         engines.append(("coqui", "Coqui TTS", "🔒 100% local e privado"))
         print("2️⃣  Coqui TTS")
         print("    🔒 100% Local (seus dados não saem do computador)")
@@ -924,6 +1281,16 @@ def get_piper_model() -> Path:
             print("\n\n👋 Cancelado pelo usuário")
             sys.exit(0)
 
+@functools.lru_cache(maxsize=None)
+def _have(cmd: str) -> bool:
+    """Verifica (uma vez por processo) se o executável responde no PATH."""
+    try:
+        subprocess.run([cmd, "-version" if cmd == "ffmpeg" else "--help"],
+                       capture_output=True, check=True)
+        return True
+    except (FileNotFoundError, subprocess.CalledProcessError):
+        return False
+
 def validate_dependencies(engine: str, **kwargs) -> None:
     """Valida dependências do engine escolhido."""
     
@@ -931,30 +1298,22 @@ def validate_dependencies(engine: str, **kwargs) -> None:
         if not edge_tts:
             raise RuntimeError("Edge-TTS não instalado. Execute: pip install edge-tts")
         # Edge-TTS sempre precisa ffmpeg para conversão
-        try:
-            subprocess.run(["ffmpeg", "-version"], capture_output=True, check=True)
-        except (FileNotFoundError, subprocess.CalledProcessError):
+        if not _have("ffmpeg"):
             raise RuntimeError("ffmpeg não encontrado no PATH (necessário para Edge-TTS)")
             
     elif engine == "piper":
         model_path = kwargs.get('model_path')
         if not model_path or not model_path.exists():
             raise FileNotFoundError(f"Modelo Piper não encontrado: {model_path}")
-        try:
-            subprocess.run(["piper", "--help"], capture_output=True, check=True)
-        except (FileNotFoundError, subprocess.CalledProcessError):
+        if not _have("piper"):
             raise RuntimeError("Piper não encontrado no PATH")
-        try:
-            subprocess.run(["ffmpeg", "-version"], capture_output=True, check=True)
-        except (FileNotFoundError, subprocess.CalledProcessError):
+        if not _have("ffmpeg"):
             raise RuntimeError("ffmpeg não encontrado no PATH")
             
     elif engine == "coqui":
-        if not TTS:
+        if not COQUI_AVAILABLE:
             raise RuntimeError("Coqui TTS não instalado. Execute: pip install TTS")
-        try:
-            subprocess.run(["ffmpeg", "-version"], capture_output=True, check=True)
-        except (FileNotFoundError, subprocess.CalledProcessError):
+        if not _have("ffmpeg"):
             raise RuntimeError("ffmpeg não encontrado no PATH")
 
 def main() -> None:
@@ -971,6 +1330,16 @@ def main() -> None:
     ap.add_argument("--ar", type=int, default=22050, help="Sample rate")
     ap.add_argument("--ac", type=int, default=1, help="Canais de áudio")
     ap.add_argument("--skip-validation", action="store_true", help="Pula validação")
+    ap.add_argument("--edge-format", choices=list(EDGE_OUTPUT_FORMATS),
+                    help="Mantém o MP3 nativo do Edge-TTS (ignora --bitrate/--ar/--ac, sem re-encode)")
+    ap.add_argument("--edge-concurrency", type=int, default=4,
+                    help="Requisições Edge-TTS simultâneas (por capítulo; no livro todo com --jobs)")
+    ap.add_argument("--jobs", type=int, default=1,
+                    help="Capítulos sintetizados em paralelo (event loop único no Edge, processos no Coqui/Piper)")
+    ap.add_argument("--device", choices=["auto", "cpu", "cuda"], default="auto",
+                    help="Dispositivo de inferência Coqui/Piper (auto detecta CUDA no Coqui; Piper usa CPU)")
+    ap.add_argument("--precision", choices=["fp32", "fp16", "int8"], default="fp32",
+                    help="Precisão do modelo: fp16 (Coqui em CUDA) ou int8 (Piper, ou Coqui em CPU)")
     
     args = ap.parse_args()
 
@@ -978,27 +1347,27 @@ def main() -> None:
         ap.error(f"Arquivo não encontrado: {args.epub_path}")
 
     # Sistema de cache inteligente (padrão: sempre usar cache)
-    book_title_preview = args.epub_path.stem
-    existing_cache = check_existing_cache(book_title_preview)
+    # Cache válido dispensa abrir/parsear o EPUB
+    cache_dir = check_existing_cache(args.epub_path.stem, args.epub_path)
+    chapters = None
     
-    if existing_cache and not args.no_cache:
-        print(f"📁 Usando cache existente: {existing_cache}")
+    if cache_dir and not args.no_cache:
+        print(f"📁 Usando cache existente: {cache_dir}")
         try:
-            metadata, chapters = load_from_cache(existing_cache)
+            metadata, chapters = load_from_cache(cache_dir)
             book_title = metadata["title"]
-            author = None  # Cache não tem autor separado
+            author = metadata.get("author")
             print(f"✅ Cache carregado: {len(chapters)} capítulos")
         except Exception as e:
             print(f"⚠️  Erro no cache ({e}), reprocessando EPUB...")
-            book_title, author, chapters = read_epub(args.epub_path)
-            cache_dir = create_cache_structure(book_title, chapters)
-    else:
-        if args.no_cache and existing_cache:
-            print(f"🔄 Flag --no-cache: ignorando cache e reprocessando EPUB")
-        
+            chapters = None
+    elif args.no_cache and cache_dir:
+        print(f"🔄 Flag --no-cache: ignorando cache e reprocessando EPUB")
+    
+    if chapters is None:
         # Lê EPUB e cria/atualiza cache
         book_title, author, chapters = read_epub(args.epub_path)
-        cache_dir = create_cache_structure(book_title, chapters)
+        cache_dir = create_cache_structure(book_title, chapters, args.epub_path, author)
         print(f"✅ EPUB processado e cache atualizado")
 
     # Seleção de engine via menu se não especificado
@@ -1010,23 +1379,36 @@ def main() -> None:
     
     if args.engine == "edge":
         voice = args.voice or get_edge_voice()
+        if args.edge_format:
+            args.bitrate, args.ar, args.ac = EDGE_OUTPUT_FORMATS[args.edge_format]
         engine_kwargs = {
             "voice": voice,
             "bitrate": args.bitrate,
             "ar": args.ar,
-            "ac": args.ac
+            "ac": args.ac,
+            "concurrency": args.edge_concurrency
         }
         
     elif args.engine == "coqui":
         model_name = args.coqui_model or get_coqui_model()
-        engine_kwargs = {"model_name": model_name}
+        engine_kwargs = {"model_name": model_name, "device": resolve_device(args.device, "coqui")}
+        if args.precision == "fp16" and engine_kwargs["device"] == "cuda":
+            engine_kwargs["precision"] = "fp16"
+        elif args.precision == "int8" and engine_kwargs["device"] == "cpu":
+            engine_kwargs["precision"] = "int8"
+        elif args.precision != "fp32":
+            print(f"⚠️  --precision {args.precision} não se aplica ao Coqui em {engine_kwargs['device']}, usando fp32")
         
     elif args.engine == "piper":
         model_path = args.model_path
         # Se modelo padrão não existe, mostra seleção
         if not model_path.exists():
             model_path = get_piper_model()
-        engine_kwargs = {"model_path": model_path}
+        if args.precision == "int8":
+            model_path = resolve_piper_model(model_path, args.precision)
+        elif args.precision != "fp32":
+            print(f"⚠️  --precision {args.precision} não se aplica ao Piper, usando fp32")
+        engine_kwargs = {"model_path": model_path, "device": resolve_device(args.device, "piper")}
 
     # Validação
     if not args.skip_validation:
@@ -1039,8 +1421,7 @@ def main() -> None:
     print(f"\n📖 INFORMAÇÕES DO LIVRO")
     print("="*60)
     print(f"Engine: {args.engine.upper()}")
-    if 'author' in locals():
-        print(f"Autor: {author or 'Desconhecido'}")
+    print(f"Autor: {author or 'Desconhecido'}")
     print(f"Título: {book_title}")
     print(f"Capítulos: {len(chapters)}")
     
@@ -1052,6 +1433,11 @@ def main() -> None:
         print(f"Modelo: {model_short}")
     elif args.engine == "piper":
         print(f"Modelo: {engine_kwargs['model_path'].name}")
+    
+    if engine_kwargs.get("device") == "cuda":
+        print("Dispositivo: CUDA (use --device cpu se a GPU ficar mais lenta)")
+    if engine_kwargs.get("precision"):
+        print(f"Precisão: {engine_kwargs['precision'].upper()}")
 
     if not chapters:
         print("\n❌ ERRO: Nenhum capítulo encontrado")
@@ -1063,8 +1449,8 @@ def main() -> None:
     print(f"Pasta: {outdir.resolve()}")
     
     # Info sobre cache
-    if existing_cache:
-        print(f"Cache: {existing_cache}")
+    if cache_dir:
+        print(f"Cache: {cache_dir}")
     
     print("="*60)
 
@@ -1074,37 +1460,52 @@ def main() -> None:
     print(f"\n🎙️  CONVERTENDO {total} CAPÍTULOS")
     print("-" * 60)
     
+    # Uma leitura do diretório em vez de um stat por capítulo
+    with os.scandir(outdir) as entries:
+        existing = {entry.name for entry in entries}
+    
+    pending = []
+    width = pad_width(total)
     for idx, (title, text) in enumerate(chapters, start=1):
         chap_title_clean = sanitize_filename(title)
-        index_str = zero_pad(idx, total)
+        index_str = f"{idx:0{width}d}"
         mp3_name = f"{index_str} - {chap_title_clean}.mp3"
         mp3_path = outdir / mp3_name
         
         # Verifica se já existe
-        if mp3_path.exists():
+        if mp3_name in existing:
             print(f"⏭️  [{index_str}/{total}] '{title}' - arquivo já existe")
             success_count += 1
             continue
-            
-        print(f"🎙️  [{index_str}/{total}] '{title[:50]}{'...' if len(title) > 50 else ''}")
-        print(f"    📝 {len(text)} caracteres", end="")
-        
-        if len(text) > 1500:
-            chunk_count = len(chunk_text(text, 1500))
-            print(f" | {chunk_count} partes")
-        else:
-            print()
         
-        try:
-            synthesize_chapter(text, args.engine, mp3_path, **engine_kwargs)
-            file_size = mp3_path.stat().st_size / 1024 / 1024  # MB
-            duration_est = len(text) / 1000 * 0.6  # Estimativa: ~0.6 min por 1000 chars
-            print(f"    ✅ Criado: {mp3_path.name} ({file_size:.1f}MB, ~{duration_est:.1f}min)")
-            success_count += 1
-        except Exception as e:
-            print(f"    ❌ ERRO: {e}")
-        
-        print()
+        pending.append((index_str, title, text, chunk_chapter(text, args.engine), mp3_path))
+    
+    progress = _progress_bar(len(pending))
+    
+    if args.jobs > 1 and len(pending) > 1 and args.engine == "edge":
+        # Edge-TTS é limitado pela rede: o livro todo num único event loop
+        print(f"⚙️  {args.jobs} capítulos em paralelo, até {engine_kwargs['concurrency']} requisições simultâneas")
+        success_count += asyncio.run(_synthesize_edge_book(pending, engine_kwargs, args.jobs, total, progress))
+    elif args.jobs > 1 and len(pending) > 1:
+        # Engines locais são CPU-bound: um capítulo por processo
+        print(f"⚙️  {args.jobs} processos em paralelo")
+        jobs = [(text, args.engine, mp3_path, engine_kwargs, chunks) for _, _, text, chunks, mp3_path in pending]
+        # CUDA não sobrevive a fork: workers GPU precisam de spawn
+        mp_context = multiprocessing.get_context("spawn") if engine_kwargs.get("device") == "cuda" else None
+        with ProcessPoolExecutor(max_workers=args.jobs, mp_context=mp_context) as ex:
+            for (index_str, title, text, chunks, mp3_path), (error, size) in zip(pending, ex.map(_synth_one, jobs)):
+                _print_chapter_start(index_str, total, title, text, len(chunks))
+                if _print_chapter_result(mp3_path, text, error, progress, size):
+                    success_count += 1
+    else:
+        for index_str, title, text, chunks, mp3_path in pending:
+            _print_chapter_start(index_str, total, title, text, len(chunks))
+            error, size = _synth_one((text, args.engine, mp3_path, engine_kwargs, chunks))
+            if _print_chapter_result(mp3_path, text, error, progress, size):
+                success_count += 1
+    
+    if progress is not None:
+        progress.close()
 
     print("=" * 60)
     print(f"🎉 CONVERSÃO FINALIZADA")
@@ -1117,24 +1518,21 @@ def main() -> None:
         print("💡 Dica: Execute novamente para tentar os que falharam")
     
     # Info sobre cache
-    cache_dir = Path(".cache") / sanitize_filename(book_title)
     if cache_dir.exists():
         print(f"📁 Cache mantido: {cache_dir}")
         print("💡 Para reprocessar EPUB: use --no-cache")
     
     print("=" * 60)
     
-    # Limpeza de arquivos temporários de preview
-    for preview_file in Path(".").glob(".preview-*.mp3"):
-        try:
-            preview_file.unlink()
-        except:
-            pass
-    for preview_file in Path(".").glob(".preview-*.wav"):
-        try:
-            preview_file.unlink()
-        except:
-            pass
+    # Limpeza de arquivos temporários de preview (uma só varredura do diretório)
+    with os.scandir(".") as entries:
+        for entry in entries:
+            name = entry.name
+            if name.startswith(".preview-") and name.endswith((".mp3", ".wav")):
+                try:
+                    os.unlink(entry.path)
+                except OSError:
+                    pass
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
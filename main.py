@@ -8,6 +8,9 @@ Versão melhorada com ETA em tempo real e --no-cache funcional.
 """
 
 import argparse
+import functools
+import logging
+import re
 import sys
 import os
 import time
@@ -16,13 +19,13 @@ from pathlib import Path
 # Adiciona o diretório src ao path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
-from cache_manager import CacheManager
-from ebook_reader import EbookReader
-from tts_factory import TTSFactory
-from converter import EbookToAudioConverter
-from progress_tracker import ProgressTracker
-from ui.menu import MenuInterface
-from config import Config
+# Os módulos do src são importados dentro de main(): --help e erros de
+# argumento não pagam o import de bs4, requests e edge_tts
+
+logger = logging.getLogger(__name__)
+
+# Voz Edge: idioma-região-nome (pt-BR-FranciscaNeural)
+_EDGE_VOICE_RE = re.compile(r'^([^-]*)-([^-]*)-([^-]*)')
 
 
 def get_engine_folder_name(engine: str, engine_config: dict) -> str:
@@ -35,12 +38,11 @@ def get_engine_folder_name(engine: str, engine_config: dict) -> str:
     if engine == "edge":
         voice = engine_config.get('voice', 'Unknown')
         # Extrai nome da voz: pt-BR-FranciscaNeural -> Francisca_pt-BR
-        if '-' in voice:
-            parts = voice.split('-')
-            if len(parts) >= 3:
-                lang = f"{parts[0]}-{parts[1]}"  # pt-BR
-                voice_name = parts[2].replace('Neural', '')  # Francisca
-                return f"EdgeTTS_{voice_name}_{lang}"
+        match = _EDGE_VOICE_RE.match(voice)
+        if match:
+            lang = f"{match[1]}-{match[2]}"  # pt-BR
+            voice_name = match[3].replace('Neural', '')  # Francisca
+            return f"EdgeTTS_{voice_name}_{lang}"
         return f"EdgeTTS_{voice}"
     
     elif engine == "coqui":
@@ -66,6 +68,19 @@ def get_engine_folder_name(engine: str, engine_config: dict) -> str:
     return f"{engine.upper()}TTS"
 
 
+@functools.lru_cache(maxsize=1)
+def get_menu():
+    """Menu interativo, carregado só quando alguma escolha não veio da linha de comando."""
+    from ui.menu import MenuInterface
+    return MenuInterface()
+
+
+def read_ebook(file_path: Path):
+    """Lê o ebook (bs4/PyPDF2 só são importados quando o cache não serve)."""
+    from ebook_reader import EbookReader
+    return EbookReader().read_ebook(file_path)
+
+
 def parse_arguments():
     """Configura e processa argumentos da linha de comando."""
     parser = argparse.ArgumentParser(
@@ -107,6 +122,12 @@ def parse_arguments():
         help="Força reprocessamento completo (ignora cache e MP3s existentes)"
     )
     
+    parser.add_argument(
+        "--resume", 
+        action="store_true", 
+        help="Retoma a conversão: só reaproveita MP3s gerados a partir do texto atual do capítulo"
+    )
+    
     parser.add_argument(
         "--bitrate", 
         default="32k", 
@@ -127,12 +148,45 @@ def parse_arguments():
         help="Canais de áudio"
     )
     
+    parser.add_argument(
+        "--fast-encode", 
+        action="store_true", 
+        help="Codificação MP3 mais rápida (LAME no modo rápido, mesmo bitrate)"
+    )
+    
     parser.add_argument(
         "--skip-validation", 
         action="store_true", 
         help="Pula validação"
     )
     
+    parser.add_argument(
+        "--debug", 
+        action="store_true", 
+        help="Mostra o traceback completo dos erros"
+    )
+    
+    parser.add_argument(
+        "--edge-concurrency", 
+        type=int, 
+        default=4, 
+        help="Requisições Edge-TTS simultâneas (por capítulo; no livro todo com --jobs)"
+    )
+    
+    parser.add_argument(
+        "--jobs", 
+        type=int, 
+        default=1, 
+        help="Capítulos convertidos em paralelo (event loop único no Edge, processos no Coqui/Piper)"
+    )
+    
+    parser.add_argument(
+        "--precision", 
+        choices=["fp32", "int8"], 
+        default="fp32", 
+        help="Precisão do modelo local: int8 quantiza Coqui/Piper para inferência em CPU"
+    )
+    
     return parser.parse_args()
 
 
@@ -141,6 +195,12 @@ def main():
     try:
         args = parse_arguments()
         
+        # --debug liga o nível DEBUG (tracebacks de cada capítulo que falhar)
+        logging.basicConfig(
+            level=logging.DEBUG if args.debug else logging.WARNING,
+            format="%(levelname)s %(name)s: %(message)s"
+        )
+        
         # Valida arquivo de entrada
         if not args.file_path.exists():
             print(f"❌ ERRO: Arquivo não encontrado: {args.file_path}")
@@ -152,38 +212,45 @@ def main():
             print(f"❌ ERRO: Formato não suportado: {file_ext}. Use .epub ou .pdf")
             sys.exit(1)
         
+        from cache_manager import CacheManager
+        from tts_factory import TTSFactory
+        from converter import EbookToAudioConverter
+        from config import Config
+        
         # Inicializa componentes
         cache_manager = CacheManager()
-        ebook_reader = EbookReader()
-        menu = MenuInterface()
         
         # Seleção de engine via menu se não especificado
         if not args.engine:
-            args.engine = menu.show_engine_menu()
+            args.engine = get_menu().show_engine_menu()
         
         # Configuração específica por engine
         tts_factory = TTSFactory()
         
         if args.engine == "edge":
-            voice = args.voice or menu.get_edge_voice()
+            voice = args.voice or get_menu().get_edge_voice()
             engine_config = {
                 "voice": voice,
                 "bitrate": args.bitrate,
                 "ar": args.ar,
-                "ac": args.ac
+                "ac": args.ac,
+                "concurrency": args.edge_concurrency,
+                "fast_encode": args.fast_encode
             }
         elif args.engine == "coqui":
             if args.coqui_model:
                 model_name = args.coqui_model
                 speaker = None
             else:
-                model_name, speaker = menu.get_coqui_model()
-            engine_config = {"model_name": model_name, "speaker": speaker}
+                model_name, speaker = get_menu().get_coqui_model()
+            engine_config = {"model_name": model_name, "speaker": speaker,
+                             "precision": args.precision, "fast_encode": args.fast_encode}
         elif args.engine == "piper":
             model_path = args.model_path
             if not model_path.exists():
-                model_path = menu.get_piper_model()
-            engine_config = {"model_path": model_path}
+                model_path = get_menu().get_piper_model()
+            engine_config = {"model_path": model_path, "precision": args.precision,
+                             "fast_encode": args.fast_encode}
         
         # Validação
         if not args.skip_validation:
@@ -196,7 +263,7 @@ def main():
         
         # Gerencia cache com --no-cache funcional
         book_title_preview = args.file_path.stem
-        existing_cache = cache_manager.check_existing_cache(book_title_preview)
+        existing_cache = cache_manager.check_existing_cache(book_title_preview, args.file_path)
         
         if existing_cache and not args.no_cache:
             print(f"📂 Usando cache existente: {existing_cache}")
@@ -204,18 +271,19 @@ def main():
                 metadata, chapters = cache_manager.load_from_cache(existing_cache)
                 book_title = metadata["title"]
                 author = None
+                book_cache_dir = existing_cache
                 print(f"✅ Cache carregado: {len(chapters)} capítulos")
             except Exception as e:
                 print(f"⚠️ Erro no cache ({e}), reprocessando arquivo...")
-                book_title, author, chapters = ebook_reader.read_ebook(args.file_path)
-                cache_manager.create_cache_structure(book_title, chapters)
+                book_title, author, chapters = read_ebook(args.file_path)
+                book_cache_dir = cache_manager.create_cache_structure(book_title, chapters, args.file_path)
         else:
             if args.no_cache and existing_cache:
                 print(f"🔄 Flag --no-cache: ignorando cache e reprocessando arquivo")
             
             # Lê arquivo e cria/atualiza cache
-            book_title, author, chapters = ebook_reader.read_ebook(args.file_path)
-            cache_manager.create_cache_structure(book_title, chapters)
+            book_title, author, chapters = read_ebook(args.file_path)
+            book_cache_dir = cache_manager.create_cache_structure(book_title, chapters, args.file_path)
             print(f"✅ {file_ext.upper()} processado e cache atualizado")
         
         # Gera nome da pasta com engine+voz
@@ -230,7 +298,10 @@ def main():
             author=author,
             chapters=chapters,
             output_format=file_ext.upper(),
-            force_reprocess=args.no_cache  # Passa flag --no-cache corretamente
+            force_reprocess=args.no_cache,  # Passa flag --no-cache corretamente
+            resume=args.resume,
+            book_cache_dir=book_cache_dir,
+            jobs=max(1, args.jobs)
         )
         
         # Inicializa conversor
@@ -244,8 +315,7 @@ def main():
         sys.exit(0)
     except Exception as e:
         print(f"\n❌ ERRO: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Conversão interrompida")
         sys.exit(1)
 
 
@@ -9,6 +9,7 @@ Corrige versões conflitantes mantendo compatibilidade.
 
 import subprocess
 import sys
+from importlib import metadata
 from pathlib import Path
 
 def check_current_versions():
@@ -21,20 +22,16 @@ def check_current_versions():
         "pydantic", "requests", "fsspec", "packaging"
     ]
     
+    # Lê a versão instalada dos metadados do pacote, sem subir um Python por pacote
     versions = {}
     for package in packages:
         try:
-            result = subprocess.run(
-                [sys.executable, "-c", f"import {package}; print({package}.__version__)"],
-                capture_output=True, text=True
-            )
-            if result.returncode == 0:
-                version = result.stdout.strip()
-                versions[package] = version
-                print(f"✅ {package}: {version}")
-            else:
-                versions[package] = "não encontrado"
-                print(f"❌ {package}: não encontrado")
+            version = metadata.version(package)
+            versions[package] = version
+            print(f"✅ {package}: {version}")
+        except metadata.PackageNotFoundError:
+            versions[package] = "não encontrado"
+            print(f"❌ {package}: não encontrado")
         except Exception:
             versions[package] = "erro"
             print(f"❌ {package}: erro ao verificar")
@@ -67,7 +64,6 @@ def create_compatible_requirements():
         
         # Core dependencies
         "beautifulsoup4": ">=4.12.0",
-        "ebooklib": ">=0.18",
         "PyPDF2": ">=3.0.0",
         "tqdm": "",
         
@@ -118,7 +114,6 @@ scipy
 # PROCESSAMENTO DE EBOOKS
 # =============================================================================
 beautifulsoup4>=4.12.0
-ebooklib>=0.18
 PyPDF2>=3.0.0
 
 # =============================================================================
@@ -182,12 +177,12 @@ def resolve_conflicts():
         "transformers", "numpy", "pandas", "fsspec", "packaging"
     ]
     
+    # Uma única chamada ao pip por passo: o resolver sobe uma vez só
     print("🗑️ Removendo pacotes conflitantes...")
-    for package in conflicting_packages:
-        print(f"   Removendo {package}...")
-        subprocess.run([
-            sys.executable, "-m", "pip", "uninstall", package, "-y"
-        ], capture_output=True)
+    print(f"   Removendo {', '.join(conflicting_packages)}...")
+    subprocess.run([
+        sys.executable, "-m", "pip", "uninstall", "-y", *conflicting_packages
+    ], capture_output=True)
     
     # Passo 2: Instala versões específicas compatíveis
     compatible_installs = [
@@ -198,89 +193,88 @@ def resolve_conflicts():
         "transformers==4.40.2",
     ]
     
+    # Todas as restrições juntas: o pip resolve o conjunto de uma vez
     print("\n📦 Instalando versões compatíveis...")
-    for package_spec in compatible_installs:
-        print(f"   Instalando {package_spec}...")
-        result = subprocess.run([
-            sys.executable, "-m", "pip", "install", package_spec
-        ], capture_output=True, text=True)
-        
-        if result.returncode != 0:
-            print(f"   ⚠️ Aviso: {result.stderr}")
-        else:
-            print(f"   ✅ Sucesso")
+    print(f"   Instalando {', '.join(compatible_installs)}...")
+    result = subprocess.run([
+        sys.executable, "-m", "pip", "install", *compatible_installs
+    ], capture_output=True, text=True)
+    
+    if result.returncode != 0:
+        print(f"   ⚠️ Aviso: {result.stderr}")
+    else:
+        print(f"   ✅ Sucesso")
     
     return True
 
-def test_fixed_installation():
-    """Testa se a instalação corrigida funciona."""
+def test_fixed_installation(full_test: bool = False):
+    """Testa se a instalação corrigida funciona.
+    
+    As versões vêm dos metadados dos pacotes (instantâneo, sem importar nada);
+    carregar o XTTS v2 (download de GBs na primeira vez) só com --full-test.
+    """
     print("\n🧪 TESTANDO INSTALAÇÃO CORRIGIDA")
     print("=" * 50)
     
-    test_code = '''
-import warnings
-warnings.filterwarnings("ignore")
-
-try:
-    import transformers
-    print(f"✅ transformers: {transformers.__version__}")
+    ok = True
     
-    if transformers.__version__ == "4.40.2":
-        print("✅ Versão correta do transformers!")
-    else:
-        print("⚠️ Versão diferente da esperada")
+    try:
+        version = metadata.version("transformers")
+        print(f"✅ transformers: {version}")
         
-except Exception as e:
-    print(f"❌ transformers: {e}")
-
-try:
-    import numpy
-    print(f"✅ numpy: {numpy.__version__}")
+        if version == "4.40.2":
+            print("✅ Versão correta do transformers!")
+        else:
+            print("⚠️ Versão diferente da esperada")
+    except metadata.PackageNotFoundError:
+        print("❌ transformers: não instalado")
+        ok = False
     
-    version_parts = numpy.__version__.split(".")
-    major = int(version_parts[0])
-    if major < 2:
-        print("✅ NumPy compatível!")
-    else:
-        print("⚠️ NumPy 2.x pode causar problemas")
+    try:
+        version = metadata.version("numpy")
+        print(f"✅ numpy: {version}")
         
-except Exception as e:
-    print(f"❌ numpy: {e}")
-
-try:
-    import pandas
-    print(f"✅ pandas: {pandas.__version__}")
-except Exception as e:
-    print(f"❌ pandas: {e}")
-
-try:
-    from TTS.api import TTS
-    print("✅ TTS importado com sucesso")
-    
-    # Teste básico XTTS
-    print("🤖 Testando XTTS v2...")
-    tts = TTS("tts_models/multilingual/multi-dataset/xtts_v2", gpu=False, progress_bar=False)
-    print("✅ XTTS v2 carregado sem erros!")
-    
-except Exception as e:
-    print(f"❌ TTS/XTTS: {e}")
-
-print("\\n🎉 Teste concluído!")
-'''
+        major = int(version.split(".")[0])
+        if major < 2:
+            print("✅ NumPy compatível!")
+        else:
+            print("⚠️ NumPy 2.x pode causar problemas")
+    except metadata.PackageNotFoundError:
+        print("❌ numpy: não instalado")
+        ok = False
     
-    result = subprocess.run([
-        sys.executable, "-c", test_code
-    ], capture_output=True, text=True)
+    try:
+        print(f"✅ pandas: {metadata.version('pandas')}")
+    except metadata.PackageNotFoundError:
+        print("❌ pandas: não instalado")
+        ok = False
     
-    print("📝 Resultado:")
-    if result.stdout:
-        print(result.stdout)
-    if result.stderr:
-        print(f"⚠️ Warnings: {result.stderr}")
+    if not full_test:
+        try:
+            print(f"✅ TTS: {metadata.version('TTS')}")
+            print("💡 Use --full-test para carregar o XTTS v2")
+        except metadata.PackageNotFoundError:
+            print("❌ TTS: não instalado")
+            ok = False
+    else:
+        import warnings
+        warnings.filterwarnings("ignore")
+        try:
+            from TTS.api import TTS
+            print("✅ TTS importado com sucesso")
+            
+            # Teste básico XTTS
+            print("🤖 Testando XTTS v2...")
+            TTS("tts_models/multilingual/multi-dataset/xtts_v2", gpu=False, progress_bar=False)
+            print("✅ XTTS v2 carregado sem erros!")
+        except Exception as e:
+            print(f"❌ TTS/XTTS: {e}")
+            ok = False
     
-    return result.returncode == 0
+    print("\n🎉 Teste concluído!")
+    return ok
 
-def main():
+def main(full_test: bool = False):
     """Função principal do resolvedor."""
     print("🔧 RESOLVEDOR DE CONFLITOS DE DEPENDÊNCIAS")
     print("=" * 60)
@@ -312,7 +306,7 @@ def main():
         print("   pip install transformers==4.40.2 --force-reinstall")
     
     # 4. Testa instalação
-    if test_fixed_installation():
+    if test_fixed_installation(full_test):
         print("\n🎉 SUCESSO! Dependências compatíveis instaladas.")
     else:
         print("\n⚠️ Ainda há problemas. Verifique os logs acima.")
@@ -328,7 +322,7 @@ def main():
 
 if __name__ == "__main__":
     try:
-        success = main()
+        success = main(full_test="--full-test" in sys.argv[1:])
         sys.exit(0 if success else 1)
     except KeyboardInterrupt:
         print("\n\n👋 Cancelado pelo usuário")
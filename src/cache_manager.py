@@ -5,9 +5,35 @@ Gerenciador de cache para otimizar reprocessamento de arquivos.
 """
 
 import json
+import os
+import pickle
 from pathlib import Path
 from typing import List, Tuple, Dict, Optional, Union
-from utils import sanitize_filename, zero_pad
+from config import PARSER_VERSION
+from utils import sanitize_filename, text_hash
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Todos os capítulos do livro num único arquivo (uma leitura + um parse)
+CHAPTERS_FILE = "chapters.pkl"
+
+# Hash do texto de cada MP3 gerado, por pasta de saída (usado por --resume)
+AUDIO_HASHES_FILE = "audio_hashes.json"
+
+
+def _json_loads(data: bytes):
+    """Decodifica JSON com orjson quando disponível."""
+    return orjson.loads(data) if orjson else json.loads(data)
+
+
+def _json_dumps(obj) -> bytes:
+    """Codifica JSON indentado (UTF-8, sem escapar acentos)."""
+    if orjson:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
 
 
 class CacheManager:
@@ -23,63 +49,89 @@ class CacheManager:
         self.cache_base_dir = Path(cache_dir)
         self.cache_base_dir.mkdir(parents=True, exist_ok=True)
     
-    def create_cache_structure(self, book_title: str, chapters: List[Tuple[str, str]]) -> Path:
+    def create_cache_structure(self, book_title: str, chapters: List[Tuple[str, str]],
+                               file_path: Optional[Path] = None) -> Path:
         """
-        Cria/atualiza estrutura de cache com textos separados.
+        Cria/atualiza estrutura de cache: chapters.pkl + metadata.json legível.
+        
+        Arquivos cujo conteúdo não mudou não são regravados.
         
         Args:
             book_title: Título do livro
             chapters: Lista de tuplas (título_capítulo, texto)
+            file_path: Ebook de origem; com ele o cache usa o nome do arquivo
+                como chave e guarda mtime/tamanho para validação
             
         Returns:
             Caminho do diretório de cache criado
         """
-        cache_dir = self.cache_base_dir / sanitize_filename(book_title)
+        cache_key = file_path.stem if file_path else book_title
+        cache_dir = self.cache_base_dir / sanitize_filename(cache_key)
         cache_dir.mkdir(parents=True, exist_ok=True)
         
         # Cria metadados
         metadata = {
             "title": book_title,
             "total_chapters": len(chapters),
-            "chapters": [],
+            # Metadados de cada capítulo, montados numa única passada
+            "chapters": [
+                {
+                    "index": idx,
+                    "title": title,
+                    "char_count": len(text),
+                    # Identifica o conteúdo: capítulos inalterados mantêm o hash entre execuções
+                    "hash": text_hash(text)
+                }
+                for idx, (title, text) in enumerate(chapters, start=1)
+            ],
             "created_at": str(Path.cwd()),
-            "processed": True
+            "processed": True,
+            "source_stamp": self._source_stamp(file_path) if file_path else None
         }
         
-        # Remove arquivos de texto antigos
-        for old_file in cache_dir.glob("*.txt"):
-            try:
-                old_file.unlink()
-            except:
-                pass
-        
-        # Cria arquivos de texto para cada capítulo
-        for idx, (title, text) in enumerate(chapters, start=1):
-            index_str = zero_pad(idx, len(chapters))
-            safe_title = sanitize_filename(title)
-            txt_name = f"{index_str} - {safe_title}.txt"
-            txt_path = cache_dir / txt_name
-            
-            # Salva texto do capítulo
-            with open(txt_path, 'w', encoding='utf-8') as f:
-                f.write(text)
-            
-            # Adiciona metadados do capítulo
-            metadata["chapters"].append({
-                "index": idx,
-                "title": title,
-                "txt_file": txt_name,
-                "char_count": len(text)
-            })
+        # Remove .txt por capítulo de caches antigos (só existem antes do blob)
+        if not (cache_dir / CHAPTERS_FILE).exists():
+            for old_file in cache_dir.glob("*.txt"):
+                try:
+                    old_file.unlink()
+                except:
+                    pass
+        
+        # Salva todos os capítulos de uma vez
+        written = self._write_if_changed(cache_dir / CHAPTERS_FILE, pickle.dumps(chapters, protocol=5))
         
         # Salva metadados
-        metadata_path = cache_dir / "metadata.json"
-        with open(metadata_path, 'w', encoding='utf-8') as f:
-            json.dump(metadata, f, indent=2, ensure_ascii=False)
+        written |= self._write_if_changed(cache_dir / "metadata.json", _json_dumps(metadata))
         
-        print(f"📁 Cache atualizado: {cache_dir} ({len(chapters)} capítulos)")
+        if written:
+            print(f"📁 Cache atualizado: {cache_dir} ({len(chapters)} capítulos)")
+        else:
+            print(f"📁 Cache inalterado: {cache_dir} ({len(chapters)} capítulos)")
         return cache_dir
     
+    @staticmethod
+    def _write_if_changed(path: Path, data: bytes) -> bool:
+        """Grava `data` só se difere do conteúdo atual; retorna se gravou.
+        
+        A escrita é atômica (arquivo temporário + rename): uma interrupção
+        nunca deixa um cache truncado.
+        """
+        try:
+            if path.stat().st_size == len(data) and path.read_bytes() == data:
+                return False
+        except OSError:
+            pass
+        tmp_path = path.with_name(path.name + ".tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+        return True
+    
+    @staticmethod
+    def _source_stamp(file_path: Path) -> List[float]:
+        """Identifica a versão do ebook (mtime + tamanho) e do parser para invalidar o cache."""
+        st = file_path.stat()
+        return [st.st_mtime, st.st_size, PARSER_VERSION]
+    
     def load_from_cache(self, cache_dir: Path) -> Tuple[Dict, List[Tuple[str, str]]]:
         """
         Carrega capítulos do cache.
@@ -94,37 +146,60 @@ class CacheManager:
             FileNotFoundError: Se cache não encontrado ou corrompido
         """
         metadata_file = cache_dir / "metadata.json"
+        chapters_file = cache_dir / CHAPTERS_FILE
         if not metadata_file.exists():
             raise FileNotFoundError("Cache metadata não encontrado")
+        if not chapters_file.exists():
+            raise FileNotFoundError("Cache de capítulos não encontrado")
         
         # Carrega metadados
-        with open(metadata_file, 'r', encoding='utf-8') as f:
-            metadata = json.load(f)
+        metadata = _json_loads(metadata_file.read_bytes())
         
-        chapters = []
-        missing_files = []
+        # Uma leitura para o livro inteiro
+        try:
+            chapters = pickle.loads(chapters_file.read_bytes())
+        except (pickle.UnpicklingError, EOFError) as e:
+            raise FileNotFoundError(f"Cache de capítulos corrompido: {e}")
         
-        # Carrega textos dos capítulos
-        for ch_meta in metadata["chapters"]:
-            txt_path = cache_dir / ch_meta["txt_file"]
-            if txt_path.exists():
-                with open(txt_path, 'r', encoding='utf-8') as f:
-                    text = f.read()
-                chapters.append((ch_meta["title"], text))
-            else:
-                missing_files.append(ch_meta["txt_file"])
+        return metadata, chapters
+    
+    def load_audio_hashes(self, cache_dir: Path) -> Dict[str, Dict[str, str]]:
+        """
+        Carrega o manifesto com o hash do texto de cada MP3 já gerado.
         
-        if missing_files:
-            raise FileNotFoundError(f"Arquivos de cache em falta: {missing_files}")
+        Args:
+            cache_dir: Diretório do cache do livro
+            
+        Returns:
+            Dicionário {pasta_de_saída: {arquivo_mp3: hash}} (vazio se não existe)
+        """
+        try:
+            return _json_loads((cache_dir / AUDIO_HASHES_FILE).read_bytes())
+        except (OSError, ValueError):
+            return {}
+    
+    def save_audio_hashes(self, cache_dir: Path, hashes: Dict[str, Dict[str, str]]) -> None:
+        """
+        Grava o manifesto de hashes dos MP3s (escrita atômica).
         
-        return metadata, chapters
+        Args:
+            cache_dir: Diretório do cache do livro
+            hashes: Dicionário {pasta_de_saída: {arquivo_mp3: hash}}
+        """
+        try:
+            self._write_if_changed(cache_dir / AUDIO_HASHES_FILE, _json_dumps(hashes))
+        except OSError:
+            pass
     
-    def check_existing_cache(self, book_title: str) -> Optional[Path]:
+    def check_existing_cache(self, book_title: str, file_path: Optional[Path] = None) -> Optional[Path]:
         """
-        Verifica se já existe cache para o livro.
+        Verifica se já existe cache válido para o livro.
         
         Args:
-            book_title: Título do livro
+            book_title: Título do livro (ou nome do arquivo)
+            file_path: Ebook de origem; se informado, o cache só vale quando
+                mtime/tamanho gravados coincidem com o arquivo atual e o
+                cache foi gerado pela mesma PARSER_VERSION
             
         Returns:
             Caminho do cache se existir, None caso contrário
@@ -132,9 +207,19 @@ class CacheManager:
         cache_dir = self.cache_base_dir / sanitize_filename(book_title)
         metadata_file = cache_dir / "metadata.json"
         
-        if cache_dir.exists() and metadata_file.exists():
-            return cache_dir
-        return None
+        # Caches antigos (só .txt por capítulo) não servem: são recriados
+        if not (metadata_file.exists() and (cache_dir / CHAPTERS_FILE).exists()):
+            return None
+        
+        if file_path is not None:
+            try:
+                stamp = _json_loads(metadata_file.read_bytes()).get("source_stamp")
+            except (OSError, ValueError):
+                return None
+            if stamp != self._source_stamp(file_path):
+                return None
+        
+        return cache_dir
     
     def delete_cache(self, book_title: str) -> bool:
         """
@@ -168,22 +253,23 @@ class CacheManager:
         """
         cached_books = []
         
-        for cache_dir in self.cache_base_dir.iterdir():
-            if cache_dir.is_dir():
-                metadata_file = cache_dir / "metadata.json"
-                if metadata_file.exists():
-                    try:
-                        with open(metadata_file, 'r', encoding='utf-8') as f:
-                            metadata = json.load(f)
-                        
-                        cached_books.append({
-                            "title": metadata.get("title", cache_dir.name),
-                            "chapters": metadata.get("total_chapters", 0),
-                            "cache_dir": str(cache_dir),
-                            "size_mb": self._get_directory_size(cache_dir)
-                        })
-                    except Exception:
-                        continue
+        # scandir traz o tipo de cada entrada junto com a listagem (sem stat extra)
+        with os.scandir(self.cache_base_dir) as entries:
+            for entry in entries:
+                if not entry.is_dir():
+                    continue
+                cache_dir = Path(entry.path)
+                try:
+                    metadata = _json_loads((cache_dir / "metadata.json").read_bytes())
+                    
+                    cached_books.append({
+                        "title": metadata.get("title", entry.name),
+                        "chapters": metadata.get("total_chapters", 0),
+                        "cache_dir": str(cache_dir),
+                        "size_mb": self._get_directory_size(cache_dir)
+                    })
+                except Exception:
+                    continue
         
         return cached_books
     
@@ -197,13 +283,20 @@ class CacheManager:
         Returns:
             Tamanho em MB
         """
+        # Pilha explícita de caminhos (str): nenhum Path criado por entrada, e
+        # um subdiretório ilegível não zera a soma do resto
         total_size = 0
-        try:
-            for file_path in directory.rglob('*'):
-                if file_path.is_file():
-                    total_size += file_path.stat().st_size
-        except Exception:
-            pass
+        stack = [os.fspath(directory)]
+        while stack:
+            try:
+                with os.scandir(stack.pop()) as entries:
+                    for entry in entries:
+                        if entry.is_file(follow_symlinks=False):
+                            total_size += entry.stat(follow_symlinks=False).st_size
+                        elif entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+            except OSError:
+                continue
         
         return total_size / (1024 * 1024)  # Converte para MB
     
@@ -223,17 +316,18 @@ class CacheManager:
         cutoff_time = time.time() - (max_age_days * 24 * 60 * 60)
         removed_count = 0
         
-        for cache_dir in self.cache_base_dir.iterdir():
-            if cache_dir.is_dir():
-                try:
-                    # Verifica idade do diretório
-                    dir_mtime = cache_dir.stat().st_mtime
-                    if dir_mtime < cutoff_time:
-                        import shutil
-                        shutil.rmtree(cache_dir)
-                        removed_count += 1
-                        print(f"🗑️ Cache antigo removido: {cache_dir.name}")
-                except Exception:
-                    continue
+        with os.scandir(self.cache_base_dir) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    try:
+                        # Verifica idade do diretório
+                        dir_mtime = entry.stat().st_mtime
+                        if dir_mtime < cutoff_time:
+                            import shutil
+                            shutil.rmtree(entry.path)
+                            removed_count += 1
+                            print(f"🗑️ Cache antigo removido: {entry.name}")
+                    except Exception:
+                        continue
         
         return removed_count
\ No newline at end of file
@@ -4,11 +4,18 @@ src/config.py
 Configurações centralizadas do sistema.
 """
 
-from dataclasses import dataclass
-from typing import List, Tuple, Dict, Any, Optional
+import re
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import MappingProxyType
+from typing import List, Tuple, Dict, Any, Optional, NamedTuple
 
+# slots=True só existe a partir do Python 3.10; antes disso usa o dataclass comum
+_DATACLASS_OPTIONS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+
+@dataclass(**_DATACLASS_OPTIONS)
 class Config:
     """Configurações centralizadas da aplicação."""
     
@@ -24,6 +31,7 @@ class Config:
     
     # Configurações de controle
     force_reprocess: bool = False  # Para --no-cache
+    resume: bool = False  # Para --resume: só reaproveita MP3 gerado do mesmo texto
     
     # Configurações de áudio
     bitrate: str = "32k"
@@ -33,6 +41,7 @@ class Config:
     # Configurações de processamento
     max_chunk_size: int = 1500
     edge_max_chunk_size: int = 8000
+    jobs: int = 1  # Capítulos convertidos em paralelo (--jobs)
     
     # Configurações de arquivo
     max_filename_length: int = 120
@@ -40,14 +49,28 @@ class Config:
     
     # Configurações de cache
     cache_dir: str = ".cache"
+    book_cache_dir: Optional[Path] = None  # Cache deste livro (chave: nome do arquivo)
     
     # Timeouts
     ffmpeg_timeout: int = 120
     piper_timeout: int = 300
     
+    # Valores derivados, calculados uma única vez em __post_init__
+    _total_chars: int = field(default=0, init=False, repr=False, compare=False)
+    _is_xtts: bool = field(default=False, init=False, repr=False, compare=False)
+    _model_short_name: str = field(default="", init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        self._total_chars = sum(len(text) for _, text in self.chapters)
+        self._is_xtts = (
+            self.engine == "coqui"
+            and "xtts" in self.engine_config.get("model_name", "").lower()
+        )
+        self._model_short_name = self._parse_model_short_name()
+    
     def get_total_chars(self) -> int:
         """Retorna total de caracteres de todos os capítulos."""
-        return sum(len(text) for _, text in self.chapters)
+        return self._total_chars
     
     def get_total_chapters(self) -> int:
         """Retorna número total de capítulos."""
@@ -55,13 +78,14 @@ class Config:
     
     def is_xtts_model(self) -> bool:
         """Verifica se o modelo é XTTS."""
-        if self.engine == "coqui":
-            model_name = self.engine_config.get("model_name", "")
-            return "xtts" in model_name.lower()
-        return False
+        return self._is_xtts
     
     def get_model_short_name(self) -> str:
         """Retorna nome curto do modelo."""
+        return self._model_short_name
+    
+    def _parse_model_short_name(self) -> str:
+        """Extrai o nome curto do modelo a partir do engine_config."""
         if self.engine == "edge":
             voice = self.engine_config.get('voice', '')
             return voice.split('-')[-1].replace('Neural', '')
@@ -73,9 +97,12 @@ class Config:
             return model_path.name if model_path else "Desconhecido"
         return "Desconhecido"
 
+# Encoder MP3 no modo mais rápido (--fast-encode): LAME com o algoritmo de
+# qualidade 9 mantém a mesma taxa CBR e pula quase toda a análise psicoacústica
+FAST_MP3_ARGS = ("-c:a", "libmp3lame", "-compression_level", "9")
 
-# Configurações de vozes Edge-TTS
-EDGE_VOICES = {
+# Configurações de vozes Edge-TTS (tabelas somente leitura)
+EDGE_VOICES = MappingProxyType({
     # Vozes femininas
     "1": ("pt-BR-FranciscaNeural", "Francisca - Feminina, natural, recomendada ⭐"),
     "2": ("pt-BR-BrendaNeural", "Brenda - Feminina, jovem"),
@@ -94,15 +121,15 @@ EDGE_VOICES = {
     "13": ("pt-BR-JulioNeural", "Julio - Masculino, forte"),
     "14": ("pt-BR-NicolauNeural", "Nicolau - Masculino, claro"),
     "15": ("pt-BR-ValerioNeural", "Valerio - Masculino, profundo")
-}
+})
 
 # Configurações de modelos Coqui TTS
-COQUI_MODELS = {
+COQUI_MODELS = MappingProxyType({
     "1": ("tts_models/multilingual/multi-dataset/xtts_v2", "XTTS v2 Multilíngue PT-BR", "Melhor qualidade, mais lento ⭐", True),
     "2": ("tts_models/multilingual/multi-dataset/xtts_v1.1", "XTTS v1.1 Multilíngue PT-BR", "Boa qualidade, médio", True),
     "3": ("tts_models/multilingual/multi-dataset/your_tts", "YourTTS Multilíngue PT-BR", "Qualidade OK, rápido", True),
     "4": ("tts_models/pt/cv/vits", "Português CV-VITS", "PT-PT, rápido, voz robótica", False)
-}
+})
 
 # Configurações de modelos Piper conhecidos
 KNOWN_PIPER_MODELS = {
@@ -112,6 +139,10 @@ KNOWN_PIPER_MODELS = {
     "pt-br_male-edresson-low.onnx": "Edresson - Masculino BR",
 }
 
+# Versão da extração de texto do ebook_reader: incremente ao mudar o que
+# os leitores extraem para invalidar os capítulos já guardados em cache
+PARSER_VERSION = 1
+
 # Padrões para detectar títulos de capítulos em PDFs
 CHAPTER_PATTERNS = [
     r'^(CAPÍTULO|Capítulo|CHAPTER|Chapter)\s+([IVXLCDM]+|\d+)',
@@ -136,10 +167,37 @@ SUBTITLE_PATTERNS = [
     r'^Aporia:',
 ]
 
+# Versões pré-compiladas numa única alternância (um match por linha)
+CHAPTER_COMBINED_RE = re.compile('|'.join(f'(?:{p})' for p in CHAPTER_PATTERNS))
+SUBTITLE_COMBINED_RE = re.compile('|'.join(f'(?:{p})' for p in SUBTITLE_PATTERNS))
+
+
+def is_chapter_title(line: str) -> bool:
+    """Verifica se a linha casa com algum padrão de título de capítulo."""
+    return CHAPTER_COMBINED_RE.match(line) is not None
+
+
+def is_subtitle_line(text: str) -> bool:
+    """Verifica se o texto casa com algum padrão de subtítulo."""
+    return SUBTITLE_COMBINED_RE.match(text) is not None
+
 # Adição ao src/config.py - Configurações expandidas do Piper
 
+class PiperModelInfo(NamedTuple):
+    """Informações de um modelo Piper conhecido."""
+    name: str
+    gender: str
+    quality: str
+    speed: str
+    description: str
+    size_mb: int
+    sample_rate: int
+    recommended: bool
+    url: str = ""
+
+
 # Configurações expandidas de modelos Piper com informações detalhadas
-PIPER_MODELS_DETAILED = {
+_PIPER_MODELS_RAW = {
     # Modelos Português Brasil - Masculinos
     "pt_BR-faber-medium.onnx": {
         "name": "Faber",
@@ -231,6 +289,11 @@ PIPER_MODEL_URLS = {
     }
 }
 
+PIPER_MODELS_DETAILED = MappingProxyType({
+    model: PiperModelInfo(**info, url=PIPER_MODEL_URLS.get(model, {}).get("url", ""))
+    for model, info in _PIPER_MODELS_RAW.items()
+})
+
 # Filtros para seleção
 PIPER_FILTERS = {
     "gender": ["Masculino", "Feminino", "Todos"],
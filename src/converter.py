@@ -4,7 +4,11 @@ src/converter.py
 Conversor principal com ETA em tempo real e --no-cache funcional.
 """
 
+import asyncio
+import logging
+import os
 import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 from typing import List, Tuple
 
@@ -15,10 +19,35 @@ from progress_tracker import ProgressTracker
 from utils import (
     sanitize_filename, get_chapter_filename, print_book_info, 
     print_conversion_summary, format_file_size, format_duration,
-    estimate_audio_duration, clean_temp_files, validate_audio_file
+    estimate_audio_duration, clean_temp_files, validate_audio_file,
+    text_hash
 )
 
 
+logger = logging.getLogger(__name__)
+
+# Engine de cada processo do pool (Coqui/Piper), criado uma vez por worker
+_worker_engine = None
+
+
+def _init_worker(engine_type: str, engine_config: dict) -> None:
+    """Cria o engine TTS do processo worker."""
+    global _worker_engine
+    _worker_engine = TTSFactory().create_engine(engine_type, engine_config)
+
+
+def _synthesize_timed(tts_engine, text: str, mp3_path: Path) -> float:
+    """Sintetiza um capítulo e retorna o tempo gasto em segundos."""
+    start = time.monotonic()
+    tts_engine.synthesize(text, mp3_path)
+    return time.monotonic() - start
+
+
+def _synthesize_in_worker(text: str, mp3_path: Path) -> float:
+    """Sintetiza um capítulo com o engine do processo worker."""
+    return _synthesize_timed(_worker_engine, text, mp3_path)
+
+
 class EbookToAudioConverter:
     """Conversor principal com progresso em tempo real e ETA."""
     
@@ -37,6 +66,12 @@ class EbookToAudioConverter:
         self.output_dir = None
         self.progress_tracker = None
         self.conversion_start_time = None
+        self.output_bytes = 0
+        self.output_files = 0
+        self.max_chunk = config.max_chunk_size
+        self.cache_dir = None
+        self.audio_hashes = {}
+        self.output_hashes = {}
         
     def convert(self) -> None:
         """Executa a conversão completa do ebook para audiolivro."""
@@ -62,12 +97,30 @@ class EbookToAudioConverter:
         total_chapters = self.config.get_total_chapters()
         self.progress_tracker = ProgressTracker(total_chapters, total_chars)
         
+        # Cache do livro, resolvido pelo main.py a partir do arquivo de origem
+        self.cache_dir = self.config.book_cache_dir
+        
+        # Hashes dos textos dos MP3s desta pasta de saída (manifesto no cache)
+        if self.cache_dir:
+            self.audio_hashes = self.cache_manager.load_audio_hashes(self.cache_dir)
+        self.output_hashes = self.audio_hashes.setdefault(self.output_dir.name, {})
+        
         # Limpa arquivos temporários antigos
         clean_temp_files(self.output_dir)
         clean_temp_files(Path("."))
         
+        # Tamanho de chunk do engine (constante durante a conversão)
+        if self.config.engine == "edge":
+            self.max_chunk = self.config.edge_max_chunk_size
+        else:
+            self.max_chunk = self.config.max_chunk_size
+        
+        # Totais dos MP3s do livro, somados à medida que cada capítulo termina
+        self.output_bytes = 0
+        self.output_files = 0
+        
         # Marca início da conversão
-        self.conversion_start_time = time.time()
+        self.conversion_start_time = time.monotonic()
     
     def _show_conversion_info(self) -> None:
         """Mostra informações da conversão."""
@@ -96,9 +149,8 @@ class EbookToAudioConverter:
         print(f"Duração estimada: ~{format_duration(estimated_minutes * 60)}")
         
         # Verifica se há cache
-        cache_dir = self.cache_manager.check_existing_cache(self.config.book_title.split('_')[0])
-        if cache_dir:
-            print(f"Cache: {cache_dir}")
+        if self.cache_dir:
+            print(f"Cache: {self.cache_dir}")
         
         print("=" * 60)
     
@@ -119,16 +171,44 @@ class EbookToAudioConverter:
         print(f"\n🎙️ CONVERTENDO {total_chapters} CAPÍTULOS")
         print("=" * 60)
         
-        for idx, (title, text) in enumerate(self.config.chapters, start=1):
-            success = self._convert_chapter_with_progress(
-                idx, title, text, total_chapters, tts_engine
-            )
-            if success:
-                success_count += 1
+        if self.config.jobs > 1:
+            success_count = self._convert_chapters_parallel(total_chapters, tts_engine)
+        else:
+            for idx, (title, text) in enumerate(self.config.chapters, start=1):
+                success = self._convert_chapter_with_progress(
+                    idx, title, text, total_chapters, tts_engine
+                )
+                if success:
+                    success_count += 1
         
         self.success_count = success_count
         self.total_chapters = total_chapters
     
+    def _can_skip(self, mp3_path: Path, text: str) -> bool:
+        """
+        Decide se o MP3 existente do capítulo pode ser reaproveitado.
+        
+        Sem flags, basta o arquivo existir e ser válido; com --resume, ele
+        também precisa ter sido gerado a partir do texto atual.
+        
+        Args:
+            mp3_path: Arquivo MP3 do capítulo
+            text: Texto atual do capítulo
+            
+        Returns:
+            True se a síntese pode ser pulada
+        """
+        if self.config.force_reprocess or not validate_audio_file(mp3_path):
+            return False
+        return not self.config.resume or self.output_hashes.get(mp3_path.name) == text_hash(text)
+    
+    def _record_text_hash(self, mp3_path: Path, text: str) -> None:
+        """Registra no manifesto do cache o hash do texto que gerou o MP3."""
+        if not self.cache_dir:
+            return
+        self.output_hashes[mp3_path.name] = text_hash(text)
+        self.cache_manager.save_audio_hashes(self.cache_dir, self.audio_hashes)
+    
     def _convert_chapter_with_progress(self, idx: int, title: str, text: str, 
                                      total: int, tts_engine) -> bool:
         """
@@ -148,9 +228,10 @@ class EbookToAudioConverter:
         mp3_name = get_chapter_filename(idx, total, title)
         mp3_path = self.output_dir / mp3_name
         
-        # Verifica se já existe (e --no-cache)
-        if mp3_path.exists() and validate_audio_file(mp3_path) and not self.config.force_reprocess:
+        # Verifica se já existe (e --no-cache / --resume)
+        if self._can_skip(mp3_path, text):
             print(f"⏭️ [{idx:03d}/{total}] '{title}' - arquivo já existe")
+            self._count_output_file(mp3_path)
             self.progress_tracker.complete_item(len(text))
             self._show_overall_progress(idx, total)  # Mostra progresso mesmo para arquivos existentes
             return True
@@ -172,7 +253,7 @@ class EbookToAudioConverter:
         try:
             # Inicia contagem de tempo
             self.progress_tracker.start_item()
-            chapter_start_time = time.time()
+            chapter_start_time = time.monotonic()
             
             # Executa síntese com callback de progresso
             print(f"    🎙️ Convertendo... ", end="", flush=True)
@@ -180,13 +261,14 @@ class EbookToAudioConverter:
             print("✓")  # Marca conversão completa
             
             # Calcula tempo do capítulo
-            chapter_elapsed = time.time() - chapter_start_time
+            chapter_elapsed = time.monotonic() - chapter_start_time
             
             # Marca como completo
             self.progress_tracker.complete_item(len(text))
             
             # Verifica se arquivo foi criado corretamente
             if validate_audio_file(mp3_path):
+                self._record_text_hash(mp3_path, text)
                 self._show_chapter_success(mp3_path, len(text), chapter_elapsed)
                 self._show_overall_progress(idx, total)  # Progresso atualizado
                 return True
@@ -196,9 +278,140 @@ class EbookToAudioConverter:
                 
         except Exception as e:
             print(f"    ❌ ERRO: {e}")
+            logger.debug("Capítulo %s falhou", title, exc_info=True)
             self.progress_tracker.complete_item(0)
             return False
     
+    def _convert_chapters_parallel(self, total: int, tts_engine) -> int:
+        """
+        Converte capítulos em paralelo: um event loop para Edge-TTS (rede) e
+        processos para Coqui/Piper (CPU/GPU).
+        
+        Args:
+            total: Total de capítulos
+            tts_engine: Engine TTS (usado pelo event loop do Edge)
+            
+        Returns:
+            Número de capítulos convertidos com sucesso
+        """
+        success_count = 0
+        pending = []
+        
+        for idx, (title, text) in enumerate(self.config.chapters, start=1):
+            mp3_path = self.output_dir / get_chapter_filename(idx, total, title)
+            
+            if self._can_skip(mp3_path, text):
+                print(f"⏭️ [{idx:03d}/{total}] '{title}' - arquivo já existe")
+                self._count_output_file(mp3_path)
+                self.progress_tracker.complete_item(len(text))
+                success_count += 1
+                continue
+            
+            if mp3_path.exists() and self.config.force_reprocess:
+                try:
+                    mp3_path.unlink()
+                except:
+                    pass
+            
+            pending.append((idx, title, text, mp3_path))
+        
+        if not pending:
+            return success_count
+        
+        jobs = min(self.config.jobs, len(pending))
+        print(f"⚙️ {jobs} capítulos em paralelo")
+        
+        if self.config.engine == "edge":
+            return success_count + asyncio.run(
+                self._convert_edge_chapters(pending, total, tts_engine, jobs)
+            )
+        
+        executor = ProcessPoolExecutor(
+            max_workers=jobs,
+            initializer=_init_worker,
+            initargs=(self.config.engine, self.config.engine_config)
+        )
+        
+        with executor:
+            futures = {
+                executor.submit(_synthesize_in_worker, text, mp3_path): (idx, title, text, mp3_path)
+                for idx, title, text, mp3_path in pending
+            }
+            
+            # Resultados chegam na ordem em que terminam
+            for future in as_completed(futures):
+                idx, title, text, mp3_path = futures[future]
+                try:
+                    chapter_elapsed, error = future.result(), None
+                except Exception as e:
+                    chapter_elapsed, error = 0.0, e
+                
+                if self._finish_parallel_chapter(idx, total, title, text, mp3_path,
+                                                 chapter_elapsed, error):
+                    success_count += 1
+        
+        return success_count
+    
+    async def _convert_edge_chapters(self, pending: list, total: int, tts_engine, jobs: int) -> int:
+        """
+        Converte capítulos Edge-TTS num único event loop.
+        
+        Todas as requisições do livro dividem um só semáforo (--edge-concurrency),
+        então o limite da Microsoft vale para o livro inteiro; `jobs` limita
+        quantos capítulos (e processos ffmpeg) ficam abertos ao mesmo tempo.
+        
+        Args:
+            pending: Capítulos a converter (idx, title, text, mp3_path)
+            total: Total de capítulos
+            tts_engine: Engine Edge-TTS
+            jobs: Capítulos simultâneos
+            
+        Returns:
+            Número de capítulos convertidos com sucesso
+        """
+        requests = asyncio.Semaphore(tts_engine.concurrency)
+        chapters = asyncio.Semaphore(jobs)
+        
+        async def convert_one(item):
+            async with chapters:
+                start = time.monotonic()
+                try:
+                    await tts_engine.synthesize_async(item[2], item[3], requests)
+                except Exception as e:
+                    return item, 0.0, e
+                return item, time.monotonic() - start, None
+        
+        success_count = 0
+        for next_done in asyncio.as_completed([convert_one(item) for item in pending]):
+            (idx, title, text, mp3_path), chapter_elapsed, error = await next_done
+            if self._finish_parallel_chapter(idx, total, title, text, mp3_path,
+                                             chapter_elapsed, error):
+                success_count += 1
+        
+        return success_count
+    
+    def _finish_parallel_chapter(self, idx: int, total: int, title: str, text: str,
+                                 mp3_path: Path, chapter_elapsed: float, error) -> bool:
+        """Mostra o resultado de um capítulo convertido em paralelo; retorna se deu certo."""
+        self._show_chapter_start(idx, total, title, text)
+        
+        if error is not None:
+            print(f"    ❌ ERRO: {error}")
+            logger.debug("Capítulo %s falhou", title, exc_info=error)
+            self.progress_tracker.complete_item(0)
+            return False
+        
+        self.progress_tracker.complete_item(len(text), chapter_elapsed)
+        
+        if validate_audio_file(mp3_path):
+            self._record_text_hash(mp3_path, text)
+            self._show_chapter_success(mp3_path, len(text), chapter_elapsed)
+            self._show_overall_progress(self.progress_tracker.completed_items, total)
+            return True
+        
+        print("    ❌ ERRO: Arquivo criado é inválido")
+        return False
+    
     def _show_chapter_start(self, idx: int, total: int, title: str, text: str) -> None:
         """Mostra informações do capítulo sendo processado."""
         # Título truncado se muito longo
@@ -207,16 +420,13 @@ class EbookToAudioConverter:
         print(f"    📝 {len(text):,} caracteres | ~{estimate_audio_duration(len(text)):.1f}min estimado")
         
         # Mostra chunks se texto for grande
-        max_chunk = 8000 if self.config.engine == "edge" else 1500
-        if len(text) > max_chunk:
-            import re
-            chunks = re.split(r'(\.\.\. \.\.\.)', text)
-            chunk_count = len([c for c in chunks if c.strip() and c != "... ..."])
+        if len(text) > self.max_chunk:
+            chunk_count = text.count("... ...") + 1
             print(f"    📦 Será dividido em ~{chunk_count} partes")
     
     def _show_chapter_success(self, mp3_path: Path, char_count: int, chapter_time: float) -> None:
         """Mostra informações de sucesso da conversão."""
-        file_size = mp3_path.stat().st_size
+        file_size = self._count_output_file(mp3_path)
         file_size_str = format_file_size(file_size)
         
         # Estima duração
@@ -229,6 +439,13 @@ class EbookToAudioConverter:
         print(f"    ✅ Criado: {mp3_path.name}")
         print(f"    📊 {file_size_str} | ~{duration_str} | {chars_per_sec:.0f} chars/s")
     
+    def _count_output_file(self, mp3_path: Path) -> int:
+        """Soma o MP3 do capítulo aos totais da conversão; retorna seu tamanho."""
+        file_size = mp3_path.stat().st_size
+        self.output_bytes += file_size
+        self.output_files += 1
+        return file_size
+    
     def _show_processing_progress(self, current: int, total: int) -> None:
         """Mostra progresso ANTES de começar a processar o capítulo."""
         progress_pct = ((current - 1) / total) * 100  # current-1 porque ainda não processou
@@ -245,7 +462,7 @@ class EbookToAudioConverter:
         progress_pct = (current / total) * 100
         
         # Calcula ETA baseado no progresso
-        elapsed = time.time() - self.conversion_start_time
+        elapsed = time.monotonic() - self.conversion_start_time
         if current > 0:
             avg_time_per_chapter = elapsed / current
             remaining_chapters = total - current
@@ -264,23 +481,28 @@ class EbookToAudioConverter:
         
         # Velocidade média se disponível
         if self.progress_tracker.speeds:
-            avg_speed = sum(self.progress_tracker.speeds) / len(self.progress_tracker.speeds)
+            avg_speed = self.progress_tracker.average_speed()
             print(f"    ⚡ Velocidade: {avg_speed:.0f} chars/s")
         
         print()  # Linha em branco para separar capítulos
     
     def _show_final_summary(self) -> None:
         """Mostra resumo final da conversão."""
-        # Calcula estatísticas
-        total_size = sum(
-            f.stat().st_size for f in self.output_dir.glob("*.mp3")
-        ) / (1024 * 1024)  # MB
+        # Calcula estatísticas a partir dos totais somados durante a conversão;
+        # só varre a pasta se algum capítulo não foi contabilizado (falhas)
+        if self.output_files == self.total_chapters:
+            file_count, total_bytes = self.output_files, self.output_bytes
+        else:
+            with os.scandir(self.output_dir) as it:
+                mp3_sizes = [e.stat().st_size for e in it if e.name.endswith(".mp3")]
+            file_count, total_bytes = len(mp3_sizes), sum(mp3_sizes)
+        total_size = total_bytes / (1024 * 1024)  # MB
         
         total_chars = self.config.get_total_chars()
         estimated_duration_minutes = estimate_audio_duration(total_chars)
         estimated_duration_str = format_duration(estimated_duration_minutes * 60)
         
-        total_elapsed = time.time() - self.conversion_start_time
+        total_elapsed = time.monotonic() - self.conversion_start_time
         elapsed_time = format_duration(total_elapsed)
         
         print_conversion_summary(
@@ -294,7 +516,7 @@ class EbookToAudioConverter:
         
         # Mostra velocidade média final
         if self.progress_tracker.speeds:
-            avg_speed = sum(self.progress_tracker.speeds) / len(self.progress_tracker.speeds)
+            avg_speed = self.progress_tracker.average_speed()
             print(f"⚡ Velocidade média final: {avg_speed:.0f} chars/s")
             
             # Calcula eficiência
@@ -304,16 +526,13 @@ class EbookToAudioConverter:
             print(f"📈 Eficiência: {efficiency:.1f}% (tempo puro TTS vs total)")
         
         # Estatísticas do arquivo
-        mp3_files = list(self.output_dir.glob("*.mp3"))
-        if mp3_files:
-            avg_file_size = sum(f.stat().st_size for f in mp3_files) / len(mp3_files) / 1024 / 1024
-            print(f"📁 {len(mp3_files)} arquivos | Tamanho médio: {avg_file_size:.1f}MB")
+        if file_count:
+            avg_file_size = total_size / file_count
+            print(f"📁 {file_count} arquivos | Tamanho médio: {avg_file_size:.1f}MB")
         
         # Info sobre cache
-        original_title = self.config.book_title.split('_')[0]  # Remove engine suffix
-        cache_dir = self.cache_manager.check_existing_cache(original_title)
-        if cache_dir:
-            print(f"📁 Cache mantido: {cache_dir}")
+        if self.cache_dir:
+            print(f"📁 Cache mantido: {self.cache_dir}")
             print("💡 Para reprocessar: use --no-cache")
         
         print("=" * 60)
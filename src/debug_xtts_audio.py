@@ -2,6 +2,7 @@
 from TTS.api import TTS
 import os
 import sys
+import shutil
 import subprocess
 import platform
 
@@ -18,11 +19,12 @@ def play_audio(file_path):
             subprocess.run(["afplay", file_path], check=False)
             print(f"🎵 Reproduzindo no macOS: {file_path}")
         elif system == "linux":  # Linux
-            # Tenta diferentes players
-            players = ["aplay", "paplay", "mpv", "vlc"]
+            # Tenta diferentes players (só os instalados)
+            players = [p for p in ("aplay", "paplay", "mpv", "vlc") if shutil.which(p)]
             for player in players:
                 try:
-                    subprocess.run([player, file_path], check=True, capture_output=True)
+                    subprocess.run([player, file_path], check=True,
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
                     print(f"🎵 Reproduzindo no Linux com {player}: {file_path}")
                     break
                 except (subprocess.CalledProcessError, FileNotFoundError):
@@ -4,17 +4,30 @@ src/ebook_reader.py
 Classes para leitura e processamento de arquivos EPUB e PDF.
 """
 
+import os
 import re
+import warnings
+import posixpath
+import zipfile
+import importlib.util
+from concurrent.futures import ProcessPoolExecutor
+import xml.etree.ElementTree as ET
 from pathlib import Path
-from typing import List, Tuple, Union, Optional
+from typing import List, Tuple, Union, Optional, Dict, BinaryIO
 from abc import ABC, abstractmethod
+from urllib.parse import unquote
 
-import ebooklib
-from ebooklib import epub
 from bs4 import BeautifulSoup
 
+try:
+    from bs4 import XMLParsedAsHTMLWarning
+    # Capítulos EPUB são XHTML: o parser HTML os lê corretamente
+    warnings.filterwarnings("ignore", category=XMLParsedAsHTMLWarning)
+except ImportError:
+    pass
+
 # Importando do config agora que foi corrigido
-from config import CHAPTER_PATTERNS, SUBTITLE_PATTERNS
+from config import is_chapter_title, is_subtitle_line
 
 try:
     import PyPDF2
@@ -22,6 +35,17 @@ try:
 except ImportError:
     PyPDF2 = None
 
+# Parser C do lxml quando instalado (mesma árvore, parse bem mais rápido)
+HTML_PARSER = "lxml" if importlib.util.find_spec("lxml") else "html.parser"
+
+# A partir de quantos documentos o parse é distribuído entre processos
+PARALLEL_MIN_DOCUMENTS = 8
+
+
+def _parse_document(html: bytes) -> Tuple[Optional[str], str]:
+    """Extrai título e texto de um documento (executado nos processos do pool)."""
+    return EPUBReader()._extract_text_from_html(html)
+
 
 class BaseEbookReader(ABC):
     """Interface base para leitores de ebook."""
@@ -40,71 +64,140 @@ class BaseEbookReader(ABC):
 class EPUBReader(BaseEbookReader):
     """Leitor especializado para arquivos EPUB."""
     
+    OPF_NS = {
+        "c": "urn:oasis:names:tc:opendocument:xmlns:container",
+        "opf": "http://www.idpf.org/2007/opf",
+        "dc": "http://purl.org/dc/elements/1.1/",
+    }
+    DOCUMENT_TYPES = ("application/xhtml+xml", "text/html")
+    
     def read(self, file_path: Path) -> Tuple[str, Optional[str], List[Tuple[str, str]]]:
-        """Lê arquivo EPUB e extrai metadados e capítulos."""
+        """
+        Lê arquivo EPUB e extrai metadados e capítulos.
+        
+        O ZIP é lido direto, sem extrair para o disco; o HTML dos capítulos
+        é parseado em paralelo quando o livro tem muitos documentos.
+        """
         print(f"[INFO] Lendo arquivo EPUB: '{file_path.name}'")
         
         try:
-            book = epub.read_epub(str(file_path))
-        except Exception as e:
+            z = zipfile.ZipFile(file_path)
+        except (zipfile.BadZipFile, OSError) as e:
             raise RuntimeError(f"Erro ao ler EPUB: {e}")
         
-        # Extrai metadados
-        title = self._extract_title(book, file_path)
-        author = self._extract_author(book)
-        
-        # Extrai capítulos
-        chapters = self._extract_chapters(book)
-        
-        if not chapters:
-            print("[AVISO] Não encontrou capítulos via spine, tentando todos os documentos...")
-            chapters = self._extract_all_documents(book)
+        with z:
+            try:
+                title, author, manifest, spine = self._read_opf(z)
+            except (KeyError, AttributeError, ET.ParseError) as e:
+                raise RuntimeError(f"Erro ao ler EPUB: {e}")
+            
+            # Extrai capítulos
+            chapters = self._extract_chapters(z, manifest, spine)
+            
+            if not chapters:
+                print("[AVISO] Não encontrou capítulos via spine, tentando todos os documentos...")
+                chapters = self._extract_all_documents(z, manifest)
         
-        return title, author, chapters
+        return title or file_path.stem, author, chapters
     
-    def _extract_title(self, book, file_path: Path) -> str:
-        """Extrai título do EPUB."""
-        titles = book.get_metadata('DC', 'title')
-        if titles:
-            return titles[0][0]
-        return file_path.stem
+    def _read_opf(self, z: zipfile.ZipFile) -> Tuple[Optional[str], Optional[str], Dict[str, Tuple[str, str]], List[str]]:
+        """
+        Lê container.xml e o OPF do EPUB.
+        
+        Args:
+            z: EPUB aberto
+            
+        Returns:
+            Tupla com (título, autor, manifesto {id: (caminho, tipo)}, spine)
+        """
+        container = ET.fromstring(z.read("META-INF/container.xml"))
+        opf_path = container.find(".//c:rootfile", self.OPF_NS).get("full-path")
+        opf = ET.fromstring(z.read(opf_path))
+        base = posixpath.dirname(opf_path)
+        
+        title = opf.findtext(".//dc:title", namespaces=self.OPF_NS)
+        author = opf.findtext(".//dc:creator", namespaces=self.OPF_NS)
+        
+        # Filhos diretos de <manifest>/<spine> ({*}: aceita OPF com ou sem namespace);
+        # o manifesto vira dict para o spine resolver cada idref em O(1)
+        manifest = {}
+        for item in opf.iterfind("{*}manifest/{*}item"):
+            href = posixpath.normpath(posixpath.join(base, unquote(item.get("href", ""))))
+            manifest[item.get("id")] = (href, item.get("media-type", ""))
+        
+        spine = [ref.get("idref") for ref in opf.iterfind("{*}spine/{*}itemref")]
+        return title, author, manifest, spine
     
-    def _extract_author(self, book) -> Optional[str]:
-        """Extrai autor do EPUB."""
-        creators = book.get_metadata('DC', 'creator')
-        if creators:
-            return creators[0][0]
-        return None
+    def _parse_documents(self, z: zipfile.ZipFile, hrefs: List[str]) -> List[Tuple[Optional[str], str]]:
+        """
+        Extrai título e texto de vários documentos do ZIP.
+        
+        Os documentos são independentes: com muitos, o parse do HTML (CPU)
+        é distribuído entre processos; a leitura do ZIP fica no processo atual.
+        
+        Args:
+            z: EPUB aberto
+            hrefs: Caminhos dos documentos dentro do ZIP
+            
+        Returns:
+            Lista de (título, texto) na ordem de `hrefs`; vazio se não existe
+        """
+        documents = []
+        for href in hrefs:
+            try:
+                documents.append(z.read(href))
+            except KeyError:
+                documents.append(None)
+        
+        found = [html for html in documents if html is not None]
+        parsed = None
+        if len(found) >= PARALLEL_MIN_DOCUMENTS and (os.cpu_count() or 1) > 1:
+            try:
+                with ProcessPoolExecutor() as executor:
+                    parsed = list(executor.map(_parse_document, found, chunksize=4))
+            except (OSError, RuntimeError):
+                parsed = None  # Sem processos disponíveis: parse sequencial
+        if parsed is None:
+            parsed = [self._extract_text_from_html(html) for html in found]
+        
+        results = iter(parsed)
+        return [next(results) if html is not None else (None, "") for html in documents]
     
-    def _extract_chapters(self, book) -> List[Tuple[str, str]]:
+    def _extract_chapters(self, z: zipfile.ZipFile, manifest: Dict[str, Tuple[str, str]],
+                          spine: List[str]) -> List[Tuple[str, str]]:
         """Extrai capítulos usando spine do EPUB."""
+        documents = []
+        for idx, idref in enumerate(spine, start=1):
+            href, media_type = manifest.get(idref, (None, None))
+            if href and media_type in self.DOCUMENT_TYPES:
+                documents.append((idx, href))
+        
         chapters = []
+        parsed = self._parse_documents(z, [href for _, href in documents])
         
-        for idx, (idref, _) in enumerate(book.spine, start=1):
-            item = book.get_item_with_id(idref)
-            if item and item.get_type() == ebooklib.ITEM_DOCUMENT:
-                title, text = self._extract_text_from_html(item.get_content())
-                if text and len(text.strip()) > 50:
-                    chapter_title = title or f"Capítulo {idx}"
-                    chapters.append((chapter_title, text))
+        for (idx, _), (title, text) in zip(documents, parsed):
+            if text and len(text.strip()) > 50:
+                chapter_title = title or f"Capítulo {idx}"
+                chapters.append((chapter_title, text))
         
         return chapters
     
-    def _extract_all_documents(self, book) -> List[Tuple[str, str]]:
+    def _extract_all_documents(self, z: zipfile.ZipFile,
+                               manifest: Dict[str, Tuple[str, str]]) -> List[Tuple[str, str]]:
         """Extrai todos os documentos como capítulos."""
+        hrefs = [href for href, media_type in manifest.values() if media_type in self.DOCUMENT_TYPES]
         chapters = []
         
-        for item in book.get_items_of_type(ebooklib.ITEM_DOCUMENT):
-            title, text = self._extract_text_from_html(item.get_content())
+        for title, text in self._parse_documents(z, hrefs):
             if text and len(text.strip()) > 50:
                 chapter_title = title or f"Capítulo {len(chapters) + 1}"
                 chapters.append((chapter_title, text))
         
         return chapters
     
-    def _extract_text_from_html(self, html_bytes: bytes) -> Tuple[Optional[str], str]:
+    def _extract_text_from_html(self, html: Union[bytes, BinaryIO]) -> Tuple[Optional[str], str]:
         """Extrai título e texto limpo do HTML preservando estrutura hierárquica."""
-        soup = BeautifulSoup(html_bytes, "html.parser")
+        soup = BeautifulSoup(html, HTML_PARSER)
         title = self._extract_html_title(soup)
         
         # Remove scripts e estilos
@@ -143,10 +236,8 @@ class EPUBReader(BaseEbookReader):
         if len(text) > 200:
             return False
         
-        text_lower = text.lower()
-        for pattern in SUBTITLE_PATTERNS:
-            if re.search(pattern, text_lower):
-                return True
+        if is_subtitle_line(text.lower()):
+            return True
         
         words = text.split()
         if len(words) <= 6 and not text.endswith('.'):
@@ -429,10 +520,8 @@ class PDFReader(BaseEbookReader):
         
         for line in lines[:5]:  # Verifica primeiras 5 linhas
             line = line.strip()
-            if line:
-                for pattern in CHAPTER_PATTERNS:
-                    if re.match(pattern, line):
-                        return True, line
+            if line and is_chapter_title(line):
+                return True, line
         
         return False, None
     
@@ -7,7 +7,7 @@ Classe para rastreamento de progresso com barra visual e ETA preciso.
 import time
 import sys
 from datetime import datetime, timedelta
-from typing import List
+from typing import List, Optional
 
 
 class ProgressTracker:
@@ -25,33 +25,34 @@ class ProgressTracker:
         self.total_chars = total_chars
         self.completed_items = 0
         self.completed_chars = 0
-        self.start_time = time.time()
+        self.start_time = time.monotonic()
         self.item_start_time = None
         self.speeds: List[float] = []  # Lista de velocidades (chars/segundo)
         self.item_times: List[float] = []  # Tempos por item
         
     def start_item(self) -> None:
         """Marca início de processamento de um item."""
-        self.item_start_time = time.time()
+        self.item_start_time = time.monotonic()
         
-    def complete_item(self, char_count: int) -> None:
+    def complete_item(self, char_count: int, elapsed: Optional[float] = None) -> None:
         """
         Marca conclusão de um item e atualiza barra de progresso.
         
         Args:
             char_count: Número de caracteres processados neste item
+            elapsed: Tempo gasto no item (itens em paralelo medem o próprio tempo)
         """
-        if self.item_start_time:
-            elapsed = time.time() - self.item_start_time
-            if elapsed > 0:
-                speed = char_count / elapsed
-                self.speeds.append(speed)
-                self.item_times.append(elapsed)
-                # Mantém apenas últimas 5 velocidades para média móvel
-                if len(self.speeds) > 5:
-                    self.speeds.pop(0)
-                if len(self.item_times) > 5:
-                    self.item_times.pop(0)
+        if elapsed is None and self.item_start_time:
+            elapsed = time.monotonic() - self.item_start_time
+        if elapsed is not None and elapsed > 0:
+            speed = char_count / elapsed
+            self.speeds.append(speed)
+            self.item_times.append(elapsed)
+            # Mantém apenas últimas 5 velocidades para média móvel
+            if len(self.speeds) > 5:
+                self.speeds.pop(0)
+            if len(self.item_times) > 5:
+                self.item_times.pop(0)
         
         self.completed_items += 1
         self.completed_chars += char_count
@@ -112,14 +113,24 @@ class ProgressTracker:
         
         # Se temos chars restantes, usa velocidade também
         if remaining_chars > 0 and self.speeds:
-            avg_speed = sum(self.speeds) / len(self.speeds)
-            seconds_by_chars = remaining_chars / avg_speed
+            seconds_by_chars = remaining_chars / self.average_speed()
             # Média ponderada entre os dois métodos
             seconds_remaining = (seconds_remaining + seconds_by_chars) / 2
         
         eta = datetime.now() + timedelta(seconds=seconds_remaining)
         return eta.strftime("%H:%M:%S")
     
+    def average_speed(self) -> float:
+        """
+        Retorna a média móvel da velocidade (últimos itens, no máximo 5).
+        
+        Returns:
+            Velocidade média em chars/s, ou 0.0 se ainda não há medições
+        """
+        if not self.speeds:
+            return 0.0
+        return sum(self.speeds) / len(self.speeds)
+    
     def get_speed(self) -> str:
         """
         Retorna velocidade média formatada.
@@ -130,7 +141,7 @@ class ProgressTracker:
         if not self.speeds:
             return "--- chars/s"
         
-        avg_speed = sum(self.speeds) / len(self.speeds)
+        avg_speed = self.average_speed()
         if avg_speed >= 1000:
             return f"{avg_speed/1000:.1f}k chars/s"
         else:
@@ -143,7 +154,7 @@ class ProgressTracker:
         Returns:
             String com tempo decorrido (Xh Ym Zs)
         """
-        elapsed = time.time() - self.start_time
+        elapsed = time.monotonic() - self.start_time
         hours = int(elapsed // 3600)
         minutes = int((elapsed % 3600) // 60)
         seconds = int(elapsed % 60)
@@ -173,10 +184,8 @@ class ProgressTracker:
         Returns:
             Dicionário com todas as estatísticas
         """
-        remaining_chars = sum(
-            len(ch[1]) for ch in getattr(self, 'chapters', [])
-            if hasattr(self, 'chapters')
-        ) if hasattr(self, 'chapters') else 0
+        # Contadores mantidos por complete_item: O(1), sem percorrer capítulos
+        remaining_chars = max(0, self.total_chars - self.completed_chars)
         
         return {
             "completed_items": self.completed_items,
@@ -187,7 +196,7 @@ class ProgressTracker:
             "elapsed_time": self.get_elapsed(),
             "current_speed": self.get_speed(),
             "eta": self.get_eta(remaining_chars),
-            "avg_speed": sum(self.speeds) / len(self.speeds) if self.speeds else 0,
+            "avg_speed": self.average_speed(),
             "estimated_total_time": self._estimate_total_time()
         }
     
@@ -196,7 +205,7 @@ class ProgressTracker:
         if self.completed_items == 0:
             return "Calculando..."
         
-        elapsed = time.time() - self.start_time
+        elapsed = time.monotonic() - self.start_time
         estimated_total = elapsed * (self.total_items / self.completed_items)
         
         hours = int(estimated_total // 3600)
@@ -218,7 +227,7 @@ class ProgressTracker:
         print(f"   📊 Caracteres processados: {self.completed_chars:,}")
         
         if self.speeds:
-            avg_speed = sum(self.speeds) / len(self.speeds)
+            avg_speed = self.average_speed()
             print(f"   ⚡ Velocidade média: {avg_speed:.0f} chars/s")
         
         if self.item_times:
@@ -229,7 +238,7 @@ class ProgressTracker:
         """Reseta o tracker para um novo processamento."""
         self.completed_items = 0
         self.completed_chars = 0
-        self.start_time = time.time()
+        self.start_time = time.monotonic()
         self.item_start_time = None
         self.speeds.clear()
         self.item_times.clear()
@@ -251,7 +260,7 @@ class ProgressTracker:
         # Estima tempo baseado em histórico
         if self.item_times:
             avg_time = sum(self.item_times) / len(self.item_times)
-            estimated_time = char_count / (sum(self.speeds) / len(self.speeds)) if self.speeds else avg_time
+            estimated_time = char_count / self.average_speed() if self.speeds else avg_time
             print(f" | ~{estimated_time:.0f}s estimado")
         else:
             print(" | primeira execução")
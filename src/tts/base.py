@@ -183,29 +183,19 @@ class AudioConverter:
                 file_list[0].rename(output_path)
             return
         
-        concat_list = output_path.parent / ".tmp-concat.txt"
+        # Protocolo concat: o ffmpeg lê os MP3s como um único fluxo e só copia
+        # os frames, sem arquivo de lista nem reanálise pelo demuxer concat
+        cmd = [
+            "ffmpeg", "-y", 
+            "-i", "concat:" + "|".join(str(file_path) for file_path in file_list), 
+            "-c", "copy", 
+            "-loglevel", "error",
+            str(output_path)
+        ]
         
-        try:
-            with open(concat_list, 'w') as f:
-                for file_path in file_list:
-                    f.write(f"file '{file_path.name}'\n")
-            
-            cmd = [
-                "ffmpeg", "-y", 
-                "-f", "concat", 
-                "-safe", "0", 
-                "-i", str(concat_list), 
-                "-c", "copy", 
-                str(output_path)
-            ]
-            
-            result = subprocess.run(cmd, capture_output=True, check=True)
-            if result.returncode != 0:
-                raise RuntimeError(f"Concatenação falhou: {result.stderr.decode()}")
-                
-        finally:
-            if concat_list.exists():
-                concat_list.unlink()
+        result = subprocess.run(cmd, capture_output=True)
+        if result.returncode != 0:
+            raise RuntimeError(f"Concatenação falhou: {result.stderr.decode()}")
 
 
 class TTSValidator:
@@ -4,17 +4,21 @@ src/tts/coqui_engine.py
 Engine TTS para Coqui TTS (100% local) - Versão corrigida para XTTS v2.
 """
 
+import re
 import sys
 import subprocess
+import importlib.util
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterable, Iterator, Optional, Sequence
 
-try:
-    from TTS.api import TTS as CoquiTTS
-    import TTS
-except ImportError:
-    TTS = None
-    CoquiTTS = None
+from config import FAST_MP3_ARGS
+
+# TTS.api (e torch) só é importado ao carregar o modelo: custa segundos
+COQUI_AVAILABLE = importlib.util.find_spec("TTS") is not None
+
+_SECTION_RE = re.compile(r'(\.\.\. \.\.\.)')
+# Frase com a pontuação original (classes disjuntas: uma passada, sem backtracking)
+_SENTENCE_RE = re.compile(r'[^.!?]+[.!?]*|[.!?]+')
 
 
 class TTSEngine:
@@ -26,10 +30,9 @@ class TTSEngine:
             return [text]
         
         chunks = []
-        import re
         
         # Divide por seções principais (pausas)
-        major_sections = re.split(r'(\.\.\. \.\.\.)', text)
+        major_sections = _SECTION_RE.split(text)
         current_chunk = ""
         
         for section in major_sections:
@@ -72,29 +75,25 @@ class TTSEngine:
                                 chunks.append(temp_chunk)
                             
                             if len(paragraph) > max_chars:
-                                # Divide por sentenças
-                                sentences = re.split(r'[.!?]+', paragraph)
+                                # Divide por sentenças, mantendo a pontuação original
                                 sent_chunk = ""
                                 
-                                for sentence in sentences:
-                                    sentence = sentence.strip()
+                                for match in _SENTENCE_RE.finditer(paragraph):
+                                    sentence = match.group().strip()
                                     if not sentence:
                                         continue
                                         
-                                    if len(sent_chunk) + len(sentence) + 2 <= max_chars:
+                                    if len(sent_chunk) + len(sentence) + 1 <= max_chars:
                                         if sent_chunk:
-                                            sent_chunk += ". " + sentence
+                                            sent_chunk += " " + sentence
                                         else:
                                             sent_chunk = sentence
                                     else:
                                         if sent_chunk:
-                                            chunks.append(sent_chunk + ".")
+                                            chunks.append(sent_chunk)
                                         sent_chunk = sentence
                                 
-                                if sent_chunk:
-                                    temp_chunk = sent_chunk + "."
-                                else:
-                                    temp_chunk = ""
+                                temp_chunk = sent_chunk
                             else:
                                 temp_chunk = paragraph
                     
@@ -113,58 +112,65 @@ class AudioConverter:
     """Utilitário para conversão de áudio usando ffmpeg."""
     
     @staticmethod
-    def convert_wav_to_mp3(wav_path: Path, mp3_path: Path, 
-                          sample_rate: int = 22050, channels: int = 1, 
-                          bitrate: str = "32k") -> None:
-        """Converte WAV para MP3 usando ffmpeg."""
+    def encode_pcm_stream(pcm_chunks: Iterable[bytes], output_path: Path,
+                          sample_format: str, input_rate: int,
+                          sample_rate: int = 22050, channels: int = 1,
+                          bitrate: str = "32k", timeout: int = 120,
+                          encoder_args: Sequence[str] = ()) -> None:
+        """
+        Codifica para MP3 o PCM mono bruto à medida que os blocos são gerados.
+        
+        O ffmpeg lê do stdin e codifica enquanto o próximo bloco é sintetizado,
+        sem WAV temporário no disco.
+        
+        Args:
+            pcm_chunks: Blocos de PCM bruto, em ordem
+            output_path: Arquivo MP3 de saída
+            sample_format: Formato do PCM para o ffmpeg (ex.: f32le, s16le)
+            input_rate: Taxa de amostragem do PCM de entrada
+            sample_rate: Taxa de amostragem do MP3
+            channels: Número de canais do MP3
+            bitrate: Taxa de bits do MP3
+            timeout: Tempo máximo para o ffmpeg terminar após o último bloco
+            encoder_args: Opções extras do encoder (ex.: FAST_MP3_ARGS)
+        """
         cmd = [
             "ffmpeg", "-y",
-            "-i", str(wav_path),
+            "-f", sample_format, "-ar", str(input_rate), "-ac", "1",
+            "-i", "pipe:0",
             "-ar", str(sample_rate),
             "-ac", str(channels),
             "-b:a", bitrate,
+            *encoder_args,
             "-loglevel", "error",
-            str(mp3_path),
+            str(output_path),
         ]
+        encoder = subprocess.Popen(
+            cmd, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE
+        )
         
         try:
-            result = subprocess.run(cmd, capture_output=True, timeout=120)
-            if result.returncode != 0:
-                raise RuntimeError(f"ffmpeg falhou: {result.stderr.decode()}")
+            for pcm in pcm_chunks:
+                encoder.stdin.write(pcm)
+        except BrokenPipeError:
+            pass  # ffmpeg morreu: o erro dele é reportado abaixo
+        except BaseException:
+            encoder.kill()
+            encoder.wait()
+            output_path.unlink(missing_ok=True)
+            raise
+        
+        try:
+            _, stderr = encoder.communicate(timeout=timeout)
         except subprocess.TimeoutExpired:
+            encoder.kill()
+            encoder.wait()
+            output_path.unlink(missing_ok=True)
             raise RuntimeError("Timeout na conversão MP3")
-    
-    @staticmethod
-    def concatenate_audio_files(file_list, output_path: Path) -> None:
-        """Concatena múltiplos arquivos de áudio."""
-        if len(file_list) <= 1:
-            if file_list:
-                file_list[0].rename(output_path)
-            return
-        
-        concat_list = output_path.parent / ".tmp-concat.txt"
         
-        try:
-            with open(concat_list, 'w') as f:
-                for file_path in file_list:
-                    f.write(f"file '{file_path.name}'\n")
-            
-            cmd = [
-                "ffmpeg", "-y", 
-                "-f", "concat", 
-                "-safe", "0", 
-                "-i", str(concat_list), 
-                "-c", "copy", 
-                str(output_path)
-            ]
-            
-            result = subprocess.run(cmd, capture_output=True, check=True)
-            if result.returncode != 0:
-                raise RuntimeError(f"Concatenação falhou: {result.stderr.decode()}")
-                
-        finally:
-            if concat_list.exists():
-                concat_list.unlink()
+        if encoder.returncode != 0:
+            output_path.unlink(missing_ok=True)
+            raise RuntimeError(f"ffmpeg falhou: {stderr.decode(errors='replace')}")
 
 
 class CoquiTTSEngine(TTSEngine):
@@ -175,13 +181,15 @@ class CoquiTTSEngine(TTSEngine):
         Inicializa o engine Coqui TTS.
         
         Args:
-            config: Configuração com model_name e speaker (opcional)
+            config: Configuração com model_name, speaker e precision (opcionais)
         """
         self.model_name = config.get('model_name', 'tts_models/multilingual/multi-dataset/xtts_v2')
         self.speaker = config.get('speaker')
+        self.precision = config.get('precision', 'fp32')
         self.sample_rate = config.get('ar', 22050)
         self.channels = config.get('ac', 1)
         self.bitrate = config.get('bitrate', '32k')
+        self.encoder_args = FAST_MP3_ARGS if config.get('fast_encode') else ()
         self._tts_instance = None
     
     def synthesize(self, text: str, output_path: Path) -> None:
@@ -192,85 +200,49 @@ class CoquiTTSEngine(TTSEngine):
             text: Texto para sintetizar
             output_path: Caminho de saída do arquivo MP3
         """
-        chunks = self.chunk_text(text, max_chars=1500)
-        
-        if len(chunks) == 1:
-            self._synthesize_single_chunk(text, output_path)
-        else:
-            self._synthesize_multiple_chunks(chunks, output_path)
+        tts = self._get_tts_instance()
+        AudioConverter.encode_pcm_stream(
+            self.synthesize_stream(text), output_path,
+            "f32le", tts.synthesizer.output_sample_rate,
+            self.sample_rate, self.channels, self.bitrate,
+            encoder_args=self.encoder_args
+        )
     
-    def _synthesize_single_chunk(self, text: str, output_path: Path) -> None:
-        """Sintetiza um único chunk."""
-        wav_tmp = output_path.with_suffix('.wav')
+    def synthesize_stream(self, text: str) -> Iterator[bytes]:
+        """
+        Sintetiza o texto chunk a chunk, entregando cada trecho assim que fica pronto.
         
-        try:
-            tts = self._get_tts_instance()
-            
-            # Verifica se é modelo XTTS e ajusta parâmetros
-            if self._is_xtts_model():
-                self._synthesize_xtts(tts, text, wav_tmp)
-            elif self.speaker and hasattr(tts, 'speakers') and tts.speakers:
-                tts.tts_to_file(text=text, file_path=str(wav_tmp), speaker=self.speaker)
-            else:
-                tts.tts_to_file(text=text, file_path=str(wav_tmp))
-            
-            # Converte para MP3
-            AudioConverter.convert_wav_to_mp3(
-                wav_tmp, output_path, 
-                self.sample_rate, self.channels, self.bitrate
-            )
+        Args:
+            text: Texto para sintetizar
             
-        finally:
-            if wav_tmp and wav_tmp.exists():
-                wav_tmp.unlink()
-    
-    def _synthesize_multiple_chunks(self, chunks: list, output_path: Path) -> None:
-        """Sintetiza múltiplos chunks e concatena."""
-        temp_files = []
+        Yields:
+            PCM float32 mono na taxa de saída do modelo
+        """
+        import numpy as np
         
-        try:
-            tts = self._get_tts_instance()
-            
-            for i, chunk in enumerate(chunks):
-                temp_wav = output_path.parent / f".tmp-coqui-{i}.wav"
-                temp_mp3 = output_path.parent / f".tmp-coqui-{i}.mp3"
-                
-                # Sintetiza chunk
-                if self._is_xtts_model():
-                    self._synthesize_xtts(tts, chunk, temp_wav)
-                elif self.speaker and hasattr(tts, 'speakers') and tts.speakers:
-                    tts.tts_to_file(text=chunk, file_path=str(temp_wav), speaker=self.speaker)
-                else:
-                    tts.tts_to_file(text=chunk, file_path=str(temp_wav))
-                
-                # Converte para MP3
-                AudioConverter.convert_wav_to_mp3(
-                    temp_wav, temp_mp3,
-                    self.sample_rate, self.channels, self.bitrate
-                )
-                temp_files.append(temp_mp3)
-                
-                # Remove WAV temporário
-                if temp_wav.exists():
-                    temp_wav.unlink()
-            
-            # Concatena arquivos
-            AudioConverter.concatenate_audio_files(temp_files, output_path)
-            
-        finally:
-            # Limpa arquivos temporários
-            for temp_file in temp_files:
-                if temp_file.exists():
-                    temp_file.unlink()
+        tts = self._get_tts_instance()
+        kwargs = self._synthesis_kwargs(tts)
+        
+        for chunk in self.chunk_text(text, max_chars=1500):
+            yield np.asarray(tts.tts(text=chunk, **kwargs), dtype=np.float32).tobytes()
+    
+    def _synthesis_kwargs(self, tts) -> Dict[str, Any]:
+        """Argumentos de speaker/idioma para tts.tts() conforme o modelo."""
+        if self._is_xtts_model():
+            return self._xtts_kwargs(tts)
+        if self.speaker and hasattr(tts, 'speakers') and tts.speakers:
+            return {"speaker": self.speaker}
+        return {}
     
-    def _synthesize_xtts(self, tts, text: str, wav_path: Path) -> None:
+    def _xtts_kwargs(self, tts) -> Dict[str, Any]:
         """
-        Sintetiza usando XTTS detectando automaticamente v1 vs v2 e configurando adequadamente.
+        Configura a síntese XTTS detectando automaticamente v1 vs v2.
         
         Args:
             tts: Instância do TTS
-            text: Texto para sintetizar
-            wav_path: Caminho do arquivo WAV de saída
+            
+        Returns:
+            Argumentos de speaker/idioma para tts.tts()
         """
         # Detecta versão do XTTS baseado no model_name
         is_v2 = "v2" in self.model_name.lower()
@@ -284,42 +256,22 @@ class CoquiTTSEngine(TTSEngine):
             if ref_voice_path.exists():
                 # Voice cloning com arquivo de referência
                 print(f"🎤 Usando voz clonada: {ref_voice_path}")
-                tts.tts_to_file(
-                    text=text,
-                    file_path=str(wav_path),
-                    speaker_wav=str(ref_voice_path),
-                    language="pt"
-                )
+                return {"speaker_wav": str(ref_voice_path), "language": "pt"}
             elif self.speaker and self.speaker.endswith('.wav'):
                 # Speaker é um arquivo de áudio
                 print(f"🎤 Usando arquivo de voz configurado: {self.speaker}")
-                tts.tts_to_file(
-                    text=text,
-                    file_path=str(wav_path),
-                    speaker_wav=self.speaker,
-                    language="pt"
-                )
+                return {"speaker_wav": self.speaker, "language": "pt"}
             elif self.speaker:
                 # Speaker é um nome pré-definido (XTTS v2 tem alguns hardcoded)
                 print(f"🎤 Usando speaker configurado: {self.speaker}")
-                tts.tts_to_file(
-                    text=text,
-                    file_path=str(wav_path),
-                    speaker=self.speaker,
-                    language="pt"
-                )
+                return {"speaker": self.speaker, "language": "pt"}
             else:
                 # Fallback: usa speakers conhecidos do XTTS v2
                 known_speakers = ["Ana Florence", "Claribel Dervla", "Tammie Ema"]
                 selected_speaker = known_speakers[0]  # Ana Florence é a melhor para PT-BR
                 
                 print(f"🎤 Usando speaker padrão para XTTS v2: {selected_speaker}")
-                tts.tts_to_file(
-                    text=text,
-                    file_path=str(wav_path),
-                    speaker=selected_speaker,
-                    language="pt"
-                )
+                return {"speaker": selected_speaker, "language": "pt"}
         else:
             print("🎤 XTTS v1 detectado - modelo tradicional")
             
@@ -330,36 +282,32 @@ class CoquiTTSEngine(TTSEngine):
                 # Usa primeiro speaker disponível
                 default_speaker = tts.speakers[0]
                 print(f"🎤 Usando speaker do v1: {default_speaker}")
-                tts.tts_to_file(
-                    text=text,
-                    file_path=str(wav_path),
-                    speaker=default_speaker,
-                    language="pt"
-                )
+                return {"speaker": default_speaker, "language": "pt"}
             elif self.speaker:
                 # Tenta usar speaker configurado
                 print(f"🎤 Tentando speaker configurado: {self.speaker}")
-                tts.tts_to_file(
-                    text=text,
-                    file_path=str(wav_path),
-                    speaker=self.speaker,
-                    language="pt"
-                )
+                return {"speaker": self.speaker, "language": "pt"}
             else:
                 # Síntese básica sem speaker (single-speaker model)
                 print("🎤 Síntese básica XTTS v1 (sem speaker)")
-                tts.tts_to_file(
-                    text=text,
-                    file_path=str(wav_path),
-                    language="pt"
-                )
+                return {"language": "pt"}
     
     def _get_tts_instance(self):
         """Obtém instância do TTS (cached) com informações corretas sobre XTTS."""
         if self._tts_instance is None:
             print(f"📥 Carregando modelo: {self.model_name}")
+            from TTS.api import TTS as CoquiTTS
             self._tts_instance = CoquiTTS(model_name=self.model_name)
             
+            if self.precision == "int8":
+                # Quantização dinâmica das camadas lineares: pesos 4x menores na CPU
+                import torch
+                torch.quantization.quantize_dynamic(
+                    self._tts_instance.synthesizer.tts_model, {torch.nn.Linear},
+                    dtype=torch.qint8, inplace=True
+                )
+                print("🔧 Modelo quantizado para int8")
+            
             # Se é XTTS, mostra informações específicas da versão
             if self._is_xtts_model():
                 is_v2 = "v2" in self.model_name.lower()
@@ -387,7 +335,7 @@ class CoquiTTSEngine(TTSEngine):
     
     def validate_dependencies(self) -> None:
         """Valida dependências do Coqui TTS."""
-        if not TTS:
+        if not COQUI_AVAILABLE:
             raise RuntimeError("Coqui TTS não instalado. Execute: pip install TTS")
         
         try:
@@ -404,7 +352,7 @@ class CoquiTTSEngine(TTSEngine):
             tts = self._get_tts_instance()
             
             if self._is_xtts_model():
-                # Para XTTS, usa a mesma lógica do _synthesize_xtts
+                # Para XTTS, usa a mesma lógica do _xtts_kwargs
                 is_v2 = "v2" in self.model_name.lower()
                 
                 if is_v2:
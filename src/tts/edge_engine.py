@@ -11,11 +11,28 @@ import re
 from pathlib import Path
 from typing import Dict, Any
 
+from config import FAST_MP3_ARGS
+
 try:
     import edge_tts
 except ImportError:
     edge_tts = None
 
+try:
+    import aiofiles
+except ImportError:
+    aiofiles = None
+
+# Padrões compilados uma vez (limpeza e divisão rodam por capítulo)
+_UNSAFE_CHARS_RE = re.compile(r'[^\w\s\.\,\!\?\:\;\-\(\)\"\'àáâãäèéêëìíîïòóôõöùúûüçñ]')
+_WHITESPACE_RE = re.compile(r'\s+')
+_LONG_DOTS_RE = re.compile(r'\.{4,}')
+_REPEATED_PAUSES_RE = re.compile(r'(\.\.\. \.\.\.){3,}')
+_SECTION_RE = re.compile(r'(\.\.\. \.\.\.)')
+# Uma frase = texto sem pontuação final seguido da pontuação (classes de
+# caracteres disjuntas: uma passada, sem backtracking)
+_SENTENCE_RE = re.compile(r'[^.!?]+[.!?]*|[.!?]+')
+
 
 class EdgeTTSEngine:
     """Engine TTS usando Microsoft Edge-TTS com tratamento robusto de erros."""
@@ -25,13 +42,25 @@ class EdgeTTSEngine:
         self.bitrate = config.get('bitrate', '32k')
         self.sample_rate = config.get('ar', 22050)
         self.channels = config.get('ac', 1)
+        self.encoder_args = FAST_MP3_ARGS if config.get('fast_encode') else ()
+        # Requisições simultâneas por capítulo (throttle da Microsoft)
+        self.concurrency = max(1, config.get('concurrency', 4))
         
     def synthesize(self, text: str, output_path: Path) -> None:
         """Sintetiza texto com tratamento robusto de erros."""
-        asyncio.run(self._synthesize_async(text, output_path))
+        asyncio.run(self.synthesize_async(text, output_path))
     
-    async def _synthesize_async(self, text: str, output_path: Path) -> None:
-        """Versão assíncrona com múltiplas tentativas."""
+    async def synthesize_async(self, text: str, output_path: Path,
+                               semaphore: asyncio.Semaphore = None) -> None:
+        """
+        Versão assíncrona com múltiplas tentativas.
+        
+        Args:
+            text: Texto para sintetizar
+            output_path: Caminho de saída do arquivo MP3
+            semaphore: Limite de requisições compartilhado entre capítulos
+                (padrão: um novo, com `concurrency` vagas)
+        """
         # Limpa e valida texto
         cleaned_text = self._clean_text(text)
         
@@ -41,23 +70,26 @@ class EdgeTTSEngine:
             return
         
         chunks = self._smart_chunk_text(cleaned_text)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.concurrency)
         
         if len(chunks) == 1:
-            await self._synthesize_single_chunk_with_retry(cleaned_text, output_path)
+            async with semaphore:
+                await self._synthesize_single_chunk_with_retry(cleaned_text, output_path)
         else:
-            await self._synthesize_multiple_chunks(chunks, output_path)
+            await self._synthesize_multiple_chunks(chunks, output_path, semaphore)
     
     def _clean_text(self, text: str) -> str:
         """Limpa texto para evitar problemas com Edge-TTS."""
         # Remove caracteres problemáticos
-        text = re.sub(r'[^\w\s\.\,\!\?\:\;\-\(\)\"\'àáâãäèéêëìíîïòóôõöùúûüçñ]', ' ', text)
+        text = _UNSAFE_CHARS_RE.sub(' ', text)
         
         # Remove múltiplos espaços e quebras
-        text = re.sub(r'\s+', ' ', text)
-        text = re.sub(r'\.{4,}', '...', text)  # Max 3 pontos
+        text = _WHITESPACE_RE.sub(' ', text)
+        text = _LONG_DOTS_RE.sub('...', text)  # Max 3 pontos
         
         # Remove pausas excessivas que podem causar problemas
-        text = re.sub(r'(\.\.\. \.\.\.){3,}', '... ... ...', text)
+        text = _REPEATED_PAUSES_RE.sub('... ... ...', text)
         
         # Limita tamanho por segurança
         if len(text) > 50000:
@@ -74,7 +106,7 @@ class EdgeTTSEngine:
         current_chunk = ""
         
         # Divide por pausas naturais primeiro
-        sections = re.split(r'(\.\.\. \.\.\.)', text)
+        sections = _SECTION_RE.split(text)
         
         for section in sections:
             if section == "... ...":
@@ -107,16 +139,14 @@ class EdgeTTSEngine:
         return [chunk for chunk in chunks if chunk.strip()]
     
     def _split_by_sentences(self, text: str, max_chars: int) -> list:
-        """Divide texto longo por frases."""
-        sentences = re.split(r'([.!?]+)', text)
+        """Divide texto longo por frases (uma única varredura do texto)."""
         chunks = []
         current_chunk = ""
         
-        for i in range(0, len(sentences), 2):
-            sentence = sentences[i].strip()
-            punctuation = sentences[i + 1] if i + 1 < len(sentences) else ""
-            
-            full_sentence = sentence + punctuation
+        for match in _SENTENCE_RE.finditer(text):
+            full_sentence = match.group().strip()
+            if not full_sentence:
+                continue
             
             if len(current_chunk) + len(full_sentence) + 1 > max_chars:
                 if current_chunk:
@@ -141,12 +171,11 @@ class EdgeTTSEngine:
             try:
                 temp_raw = output_path.with_suffix(f'.tmp{attempt}.mp3')
                 
-                communicate = edge_tts.Communicate(text, self.voice)
-                await communicate.save(str(temp_raw))
+                await self._save_audio(text, temp_raw)
                 
                 # Verifica se arquivo foi criado e tem conteúdo
                 if temp_raw.exists() and temp_raw.stat().st_size > 1000:  # Mínimo 1KB
-                    self._compress_audio(temp_raw, output_path)
+                    await asyncio.to_thread(self._compress_audio, temp_raw, output_path)
                     if temp_raw.exists():
                         temp_raw.unlink()
                     return
@@ -165,11 +194,10 @@ class EdgeTTSEngine:
                         print(f"    🔄 Tentando com texto simplificado...")
                         try:
                             temp_raw = output_path.with_suffix('.tmp_simple.mp3')
-                            communicate = edge_tts.Communicate(simplified_text, self.voice)
-                            await communicate.save(str(temp_raw))
+                            await self._save_audio(simplified_text, temp_raw)
                             
                             if temp_raw.exists() and temp_raw.stat().st_size > 1000:
-                                self._compress_audio(temp_raw, output_path)
+                                await asyncio.to_thread(self._compress_audio, temp_raw, output_path)
                                 if temp_raw.exists():
                                     temp_raw.unlink()
                                 return
@@ -184,6 +212,22 @@ class EdgeTTSEngine:
                 # Aguarda antes da próxima tentativa
                 await asyncio.sleep(2 ** attempt)
     
+    async def _save_audio(self, text: str, path: Path) -> None:
+        """Grava o áudio do Edge-TTS sem bloquear o event loop com I/O de disco."""
+        communicate = edge_tts.Communicate(text, self.voice)
+        
+        if aiofiles:
+            async with aiofiles.open(path, "wb") as f:
+                async for message in communicate.stream():
+                    if message["type"] == "audio":
+                        await f.write(message["data"])
+        else:
+            audio = bytearray()
+            async for message in communicate.stream():
+                if message["type"] == "audio":
+                    audio.extend(message["data"])
+            await asyncio.to_thread(path.write_bytes, bytes(audio))
+    
     def _simplify_text(self, text: str) -> str:
         """Simplifica texto removendo elementos problemáticos."""
         # Remove símbolos especiais
@@ -199,56 +243,114 @@ class EdgeTTSEngine:
         
         return text.strip()
     
-    async def _synthesize_multiple_chunks(self, chunks: list, output_path: Path) -> None:
-        """Sintetiza múltiplos chunks com tratamento de erro."""
-        temp_files = []
+    async def _fetch_audio(self, text: str) -> bytes:
+        """Recebe o MP3 do Edge-TTS em memória, sem arquivo temporário."""
+        communicate = edge_tts.Communicate(text, self.voice)
+        audio = bytearray()
+        async for message in communicate.stream():
+            if message["type"] == "audio":
+                audio.extend(message["data"])
+        return bytes(audio)
+    
+    async def _synthesize_chunk(self, i: int, chunk: str,
+                                semaphore: asyncio.Semaphore) -> bytes:
+        """Sintetiza um chunk (até 2 tentativas); retorna o MP3 ou b"" se falhou."""
+        async with semaphore:
+            for attempt in range(2):
+                try:
+                    audio = await self._fetch_audio(chunk)
+                    if len(audio) > 500:
+                        return audio
+                except Exception as e:
+                    print(f"    ⚠️ Erro no chunk {i+1}, tentativa {attempt+1}: {e}")
+                    await asyncio.sleep(1)
+        return b""
+    
+    async def _synthesize_multiple_chunks(self, chunks: list, output_path: Path,
+                                          semaphore: asyncio.Semaphore) -> None:
+        """Sintetiza múltiplos chunks com tratamento de erro.
+        
+        Os chunks são requisitados em paralelo (limitados por `semaphore`) e o
+        MP3 de cada um vai, na ordem do texto, para o stdin de um único ffmpeg
+        (-f mp3): a codificação dos chunks já recebidos corre enquanto os
+        seguintes ainda estão sendo baixados.
+        """
+        encoder = await self._start_stream_encoder(output_path)
+        tasks = [
+            asyncio.create_task(self._synthesize_chunk(i, chunk, semaphore))
+            for i, chunk in enumerate(chunks)
+        ]
+        fed = 0
+        encoder_died = False
         
         try:
-            for i, chunk in enumerate(chunks):
-                temp_raw = output_path.parent / f".tmp-edge-raw-{i}.mp3"
-                temp_compressed = output_path.parent / f".tmp-edge-{i}.mp3"
-                
-                # Tenta sintetizar chunk
-                success = False
-                for attempt in range(2):
-                    try:
-                        communicate = edge_tts.Communicate(chunk, self.voice)
-                        await communicate.save(str(temp_raw))
-                        
-                        if temp_raw.exists() and temp_raw.stat().st_size > 500:
-                            self._compress_audio(temp_raw, temp_compressed)
-                            temp_files.append(temp_compressed)
-                            success = True
-                            break
-                    except Exception as e:
-                        print(f"    ⚠️ Erro no chunk {i+1}, tentativa {attempt+1}: {e}")
-                        await asyncio.sleep(1)
-                    finally:
-                        if temp_raw.exists():
-                            temp_raw.unlink()
-                
-                if not success:
+            # Alimenta o encoder na ordem do texto, conforme os chunks chegam
+            for i, task in enumerate(tasks):
+                audio = await task
+                if not audio:
                     print(f"    ⚠️ Chunk {i+1} falhou, pulando...")
+                    continue
+                try:
+                    encoder.stdin.write(audio)
+                    await encoder.stdin.drain()
+                except (BrokenPipeError, ConnectionResetError):
+                    encoder_died = True  # o erro do ffmpeg é reportado abaixo
+                    break
+                fed += 1
             
-            # Concatena arquivos que funcionaram
-            if temp_files:
-                self._concatenate_audio_files(temp_files, output_path)
+            if fed or encoder_died:
+                await self._finish_stream_encoder(encoder)
             else:
                 # Se nenhum chunk funcionou, cria áudio silencioso
+                await self._kill_encoder(encoder)
                 print(f"    ⚠️ Nenhum chunk foi sintetizado, criando áudio silencioso")
                 self._create_silent_audio(output_path)
-                
+        except BaseException:
+            # Não deixa MP3 parcial que seria tomado como capítulo pronto
+            await self._kill_encoder(encoder)
+            output_path.unlink(missing_ok=True)
+            raise
         finally:
-            # Limpa arquivos temporários
-            for temp_file in temp_files:
-                if temp_file.exists():
-                    temp_file.unlink()
-            
-            for temp_raw in output_path.parent.glob(".tmp-edge-raw-*.mp3"):
-                try:
-                    temp_raw.unlink()
-                except:
-                    pass
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+    
+    async def _start_stream_encoder(self, output_path: Path) -> asyncio.subprocess.Process:
+        """Inicia um único ffmpeg que lê MP3 contínuo pelo stdin e recodifica."""
+        return await asyncio.create_subprocess_exec(
+            "ffmpeg", "-y",
+            "-f", "mp3",
+            "-i", "pipe:0",
+            "-ar", str(self.sample_rate),
+            "-ac", str(self.channels),
+            "-b:a", self.bitrate,
+            *self.encoder_args,
+            "-loglevel", "error",
+            str(output_path),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE
+        )
+    
+    async def _finish_stream_encoder(self, encoder: asyncio.subprocess.Process) -> None:
+        """Fecha o stdin e aguarda o ffmpeg terminar a codificação."""
+        encoder.stdin.close()
+        try:
+            _, stderr = await asyncio.wait_for(encoder.communicate(), timeout=600)
+        except asyncio.TimeoutError:
+            await self._kill_encoder(encoder)
+            raise RuntimeError("Timeout na conversão MP3")
+        if encoder.returncode != 0:
+            raise RuntimeError(f"Erro na conversão: {stderr.decode(errors='replace')}")
+    
+    @staticmethod
+    async def _kill_encoder(encoder: asyncio.subprocess.Process) -> None:
+        """Encerra o ffmpeg (se ainda estiver rodando) e aguarda o processo."""
+        try:
+            encoder.kill()
+        except ProcessLookupError:
+            pass
+        await encoder.wait()
     
     def _create_silent_audio(self, output_path: Path) -> None:
         """Cria arquivo de áudio silencioso quando síntese falha."""
@@ -259,6 +361,7 @@ class EdgeTTSEngine:
             "-ar", str(self.sample_rate),
             "-ac", str(self.channels),
             "-b:a", self.bitrate,
+            *self.encoder_args,
             "-loglevel", "error",
             str(output_path)
         ]
@@ -278,6 +381,7 @@ class EdgeTTSEngine:
             "-ar", str(self.sample_rate),
             "-ac", str(self.channels),
             "-b:a", self.bitrate,
+            *self.encoder_args,
             "-loglevel", "error",
             str(output_path)
         ]
@@ -286,37 +390,6 @@ class EdgeTTSEngine:
         if result.returncode != 0:
             raise RuntimeError(f"Erro na conversão: {result.stderr.decode()}")
     
-    def _concatenate_audio_files(self, file_list: list, output_path: Path) -> None:
-        """Concatena múltiplos arquivos de áudio."""
-        if len(file_list) <= 1:
-            if file_list:
-                file_list[0].rename(output_path)
-            return
-        
-        concat_list = output_path.parent / ".tmp-concat.txt"
-        
-        try:
-            with open(concat_list, 'w') as f:
-                for file_path in file_list:
-                    f.write(f"file '{file_path.name}'\n")
-            
-            cmd = [
-                "ffmpeg", "-y", 
-                "-f", "concat", 
-                "-safe", "0", 
-                "-i", str(concat_list), 
-                "-c", "copy", 
-                str(output_path)
-            ]
-            
-            result = subprocess.run(cmd, capture_output=True, check=True)
-            if result.returncode != 0:
-                raise RuntimeError(f"Concatenação falhou: {result.stderr.decode()}")
-                
-        finally:
-            if concat_list.exists():
-                concat_list.unlink()
-    
     def validate_dependencies(self) -> None:
         """Valida dependências do Edge-TTS."""
         if not edge_tts:
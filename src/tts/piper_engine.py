@@ -4,9 +4,54 @@ src/tts/piper_engine.py
 Engine TTS para Piper (100% local CLI) - Nome de classe corrigido.
 """
 
+import json
+import shutil
 import subprocess
+import threading
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Iterator
+
+from config import FAST_MP3_ARGS
+from tts.coqui_engine import AudioConverter
+
+# Bytes lidos do stdout do Piper por vez (~1,5s de áudio s16le a 22050 Hz)
+PCM_READ_SIZE = 64 * 1024
+
+# Tempo máximo de uma síntese Piper (segundos), contado desde o início do processo
+PIPER_TIMEOUT = 300
+
+
+def resolve_piper_model(model_path: Path, precision: str) -> Path:
+    """
+    Retorna o modelo Piper na precisão pedida, quantizando para int8 na primeira vez.
+    
+    Args:
+        model_path: Modelo .onnx original (fp32)
+        precision: "fp32" ou "int8"
+        
+    Returns:
+        Caminho do modelo a usar (<modelo>.int8.onnx quando quantizado)
+    """
+    if precision != "int8" or model_path.name.endswith(".int8.onnx"):
+        return model_path
+    
+    quantized = model_path.with_name(f"{model_path.stem}.int8.onnx")
+    if not quantized.exists():
+        try:
+            from onnxruntime.quantization import quantize_dynamic, QuantType
+        except ImportError:
+            print("⚠️  onnxruntime não instalado, usando modelo fp32")
+            return model_path
+        print(f"🔧 Quantizando {model_path.name} para int8 (apenas na primeira vez)...")
+        quantize_dynamic(str(model_path), str(quantized), weight_type=QuantType.QInt8)
+    
+    # Piper procura a configuração em <modelo>.onnx.json
+    config = model_path.with_name(model_path.name + ".json")
+    quantized_config = quantized.with_name(quantized.name + ".json")
+    if config.exists() and not quantized_config.exists():
+        shutil.copyfile(config, quantized_config)
+    
+    return quantized
 
 
 class PiperTTSEngine:  # ← CORRIGIDO: era TTSEngine
@@ -17,15 +62,18 @@ class PiperTTSEngine:  # ← CORRIGIDO: era TTSEngine
         Inicializa o engine Piper TTS.
         
         Args:
-            config: Configuração com model_path
+            config: Configuração com model_path e precision (opcional)
         """
         self.model_path = config.get('model_path')
         self.sample_rate = config.get('ar', 22050)
         self.channels = config.get('ac', 1)
         self.bitrate = config.get('bitrate', '32k')
+        self.encoder_args = FAST_MP3_ARGS if config.get('fast_encode') else ()
         
         if not self.model_path or not self.model_path.exists():
             raise FileNotFoundError(f"Modelo Piper não encontrado: {self.model_path}")
+        
+        self.model_path = resolve_piper_model(self.model_path, config.get('precision', 'fp32'))
     
     def chunk_text(self, text: str, max_chars: int = 1500):
         """Divide texto em chunks menores respeitando pontuação."""
@@ -123,51 +171,94 @@ class PiperTTSEngine:  # ← CORRIGIDO: era TTSEngine
             text: Texto para sintetizar
             output_path: Caminho de saída do arquivo MP3
         """
-        wav_tmp = output_path.with_suffix('.wav')
+        AudioConverter.encode_pcm_stream(
+            self.synthesize_stream(text), output_path,
+            "s16le", self._model_sample_rate(),
+            self.sample_rate, self.channels, self.bitrate,
+            encoder_args=self.encoder_args
+        )
+    
+    def synthesize_stream(self, text: str) -> Iterator[bytes]:
+        """
+        Sintetiza o texto com Piper, entregando o PCM conforme cada frase fica pronta.
         
+        Args:
+            text: Texto para sintetizar
+            
+        Yields:
+            PCM s16le mono na taxa do modelo (--output_raw)
+        """
         cmd = [
             "piper",
             "--model", str(self.model_path),
-            "--output_file", str(wav_tmp)
+            "--output_raw"
         ]
         
         try:
-            result = subprocess.run(
-                cmd, 
-                input=text, 
-                text=True, 
-                capture_output=True, 
-                timeout=300
+            piper = subprocess.Popen(
+                cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE
             )
+        except OSError as e:
+            raise RuntimeError(f"Piper falhou: {e}")
+        
+        # Texto e stderr vão por threads próprias: o Piper emite áudio (e logs)
+        # antes de ler tudo, e um pipe cheio travaria o processo
+        def feed():
+            try:
+                piper.stdin.write(text.encode('utf-8'))
+                piper.stdin.close()
+            except OSError:
+                pass
+        
+        stderr_parts = []
+        threads = [
+            threading.Thread(target=feed, daemon=True),
+            threading.Thread(target=lambda: stderr_parts.append(piper.stderr.read()), daemon=True),
+        ]
+        for thread in threads:
+            thread.start()
+        
+        # O prazo vale para a síntese toda: um Piper travado (sem fechar o
+        # stdout) é morto pelo timer, o que encerra a leitura abaixo com EOF
+        timed_out = threading.Event()
+        
+        def on_timeout():
+            timed_out.set()
+            piper.kill()
+        
+        watchdog = threading.Timer(PIPER_TIMEOUT, on_timeout)
+        watchdog.daemon = True
+        watchdog.start()
+        
+        try:
+            while True:
+                pcm = piper.stdout.read(PCM_READ_SIZE)
+                if not pcm:
+                    break
+                yield pcm
             
-            if result.returncode != 0:
-                raise RuntimeError(f"Piper falhou: {result.stderr}")
-            
-            # Converte WAV para MP3
-            self._convert_wav_to_mp3(wav_tmp, output_path)
-            
+            piper.wait()
+            for thread in threads:
+                thread.join()
+            if timed_out.is_set():
+                raise RuntimeError("Timeout na síntese")
+            if piper.returncode != 0:
+                stderr = b"".join(stderr_parts).decode(errors='replace')
+                raise RuntimeError(f"Piper falhou: {stderr}")
         finally:
-            if wav_tmp.exists():
-                wav_tmp.unlink()
+            watchdog.cancel()
+            if piper.poll() is None:
+                piper.kill()
+                piper.wait()
     
-    def _convert_wav_to_mp3(self, wav_path: Path, mp3_path: Path) -> None:
-        """Converte WAV para MP3 usando ffmpeg."""
-        cmd = [
-            "ffmpeg", "-y",
-            "-i", str(wav_path),
-            "-ar", str(self.sample_rate),
-            "-ac", str(self.channels),
-            "-b:a", self.bitrate,
-            "-loglevel", "error",
-            str(mp3_path),
-        ]
-        
+    def _model_sample_rate(self) -> int:
+        """Taxa de amostragem do modelo (lida de <modelo>.onnx.json)."""
         try:
-            result = subprocess.run(cmd, capture_output=True, timeout=120)
-            if result.returncode != 0:
-                raise RuntimeError(f"ffmpeg falhou: {result.stderr.decode()}")
-        except subprocess.TimeoutExpired:
-            raise RuntimeError("Timeout na conversão MP3")
+            config_path = self.model_path.with_name(self.model_path.name + ".json")
+            config = json.loads(config_path.read_bytes())
+            return int(config["audio"]["sample_rate"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return 22050
     
     def validate_dependencies(self) -> None:
         """Valida dependências do Piper."""
@@ -4,33 +4,37 @@ src/tts_factory.py
 Factory para criação de engines TTS.
 """
 
+import importlib
+import importlib.util
 from typing import Dict, Any
-from tts.edge_engine import EdgeTTSEngine
-from tts.coqui_engine import CoquiTTSEngine
-from tts.piper_engine import PiperTTSEngine
 
 
 class TTSFactory:
     """Factory para criação de engines TTS apropriados."""
     
+    # Engines já criados por (tipo, configuração): o modelo carrega uma vez
+    # por processo, mesmo que validação e conversão peçam o engine de novo
+    _instances: Dict[tuple, Any] = {}
+    
     def __init__(self):
         """Inicializa a factory."""
+        # (módulo, classe): o módulo do engine só é importado quando usado
         self._engines = {
-            'edge': EdgeTTSEngine,
-            'coqui': CoquiTTSEngine,
-            'piper': PiperTTSEngine
+            'edge': ('tts.edge_engine', 'EdgeTTSEngine'),
+            'coqui': ('tts.coqui_engine', 'CoquiTTSEngine'),
+            'piper': ('tts.piper_engine', 'PiperTTSEngine')
         }
     
     def create_engine(self, engine_type: str, config: Dict[str, Any]):
         """
-        Cria uma instância do engine TTS apropriado.
+        Cria (ou reutiliza) uma instância do engine TTS apropriado.
         
         Args:
             engine_type: Tipo do engine ('edge', 'coqui', 'piper')
             config: Configuração específica do engine
             
         Returns:
-            Instância do engine TTS
+            Instância do engine TTS (a mesma para tipo e configuração iguais)
             
         Raises:
             ValueError: Se o tipo de engine não for suportado
@@ -38,8 +42,19 @@ class TTSFactory:
         if engine_type not in self._engines:
             raise ValueError(f"Engine não suportado: {engine_type}")
         
-        engine_class = self._engines[engine_type]
-        return engine_class(config)
+        module_name, class_name = self._engines[engine_type]
+        engine_class = getattr(importlib.import_module(module_name), class_name)
+        
+        try:
+            key = (engine_type, tuple(sorted(config.items())))
+            hash(key)
+        except TypeError:
+            # Configuração com valores não-hasheáveis: sem reaproveitamento
+            return engine_class(config)
+        
+        if key not in self._instances:
+            self._instances[key] = engine_class(config)
+        return self._instances[key]
     
     def get_supported_engines(self) -> list:
         """
@@ -60,18 +75,14 @@ class TTSFactory:
         Returns:
             True se o engine estiver disponível
         """
-        try:
-            if engine_type == 'edge':
-                import edge_tts
-                return True
-            elif engine_type == 'coqui':
-                import TTS
-                return True
-            elif engine_type == 'piper':
-                # Verifica se há modelos disponíveis
-                from pathlib import Path
-                models_dir = Path("./models")
-                return models_dir.exists() and list(models_dir.glob("*.onnx"))
-            return False
-        except ImportError:
-            return False
\ No newline at end of file
+        # find_spec localiza o pacote sem importá-lo (TTS puxa torch: segundos)
+        if engine_type == 'edge':
+            return importlib.util.find_spec('edge_tts') is not None
+        elif engine_type == 'coqui':
+            return importlib.util.find_spec('TTS') is not None
+        elif engine_type == 'piper':
+            # Verifica se há modelos disponíveis
+            from pathlib import Path
+            models_dir = Path("./models")
+            return models_dir.exists() and list(models_dir.glob("*.onnx"))
+        return False
\ No newline at end of file
@@ -15,7 +15,7 @@ from typing import Tuple, Optional
 # Imports relativos para config
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
-from config import EDGE_VOICES, COQUI_MODELS
+from config import EDGE_VOICES, COQUI_MODELS, PIPER_MODELS_DETAILED, PiperModelInfo
 from tts_factory import TTSFactory
 
 try:
@@ -23,26 +23,11 @@ try:
 except ImportError:
     edge_tts = None
 
-try:
-    import TTS
-    from TTS.api import TTS as CoquiTTS
-except ImportError:
-    TTS = None
-    CoquiTTS = None
-
-# Configurações Piper
-PIPER_MODELS_DETAILED = {
-    "pt_BR-faber-medium.onnx": {
-        "name": "Faber", "gender": "Masculino", "quality": "Médio",
-        "description": "Voz masculina natural ⭐", "size_mb": 63,
-        "url": "https://github.com/rhasspy/piper/releases/download/v1.2.0/pt_BR-faber-medium.tar.gz"
-    },
-    "pt_BR-faber-low.onnx": {
-        "name": "Faber", "gender": "Masculino", "quality": "Baixo", 
-        "description": "Voz masculina rápida", "size_mb": 20,
-        "url": "https://github.com/rhasspy/piper/releases/download/v1.2.0/pt_BR-faber-low.tar.gz"
-    }
-}
+# Modelo .onnx local que não está no catálogo do config
+_UNKNOWN_PIPER_MODEL = PiperModelInfo(
+    name="Personalizado", gender="?", quality="?", speed="?",
+    description="Modelo personalizado", size_mb=0, sample_rate=22050, recommended=False
+)
 
 
 class MenuInterface:
@@ -196,19 +181,16 @@ class MenuInterface:
         local_models = {}
         for i, onnx_file in enumerate(self.models_dir.glob("*.onnx"), 1):
             model_name = onnx_file.name
-            info = PIPER_MODELS_DETAILED.get(model_name, {
-                "name": "Personalizado", "gender": "?", 
-                "quality": "?", "description": "Modelo personalizado"
-            })
+            info = PIPER_MODELS_DETAILED.get(model_name, _UNKNOWN_PIPER_MODEL)
             
             local_models[str(i)] = (onnx_file, info)
             
-            gender_icon = "👨" if info['gender'] == "Masculino" else "👩" if info['gender'] == "Feminino" else "🤖"
-            star = " ⭐" if "⭐" in info['description'] else ""
+            gender_icon = "👨" if info.gender == "Masculino" else "👩" if info.gender == "Feminino" else "🤖"
+            star = " ⭐" if "⭐" in info.description else ""
             size_mb = onnx_file.stat().st_size / 1024 / 1024
             
-            print(f"  {i:>2}️⃣ {gender_icon} {info['name']} - {info['description']}{star}")
-            print(f"      📊 {info['quality']} | {size_mb:.1f}MB")
+            print(f"  {i:>2}️⃣ {gender_icon} {info.name} - {info.description}{star}")
+            print(f"      📊 {info.quality} | {size_mb:.1f}MB")
         
         if not local_models:
             print("❌ Nenhum modelo em ./models/")
@@ -234,7 +216,7 @@ class MenuInterface:
         
         if 1 <= choice <= total_models:
             model_path, info = local_models[str(choice)]
-            print(f"\n🔧 Selecionado: {info['name']}")
+            print(f"\n🔧 Selecionado: {info.name}")
             
             if self._confirm("🎧 Testar?"):
                 self._preview_piper_voice(model_path)
@@ -260,11 +242,11 @@ class MenuInterface:
         
         for model_name, info in PIPER_MODELS_DETAILED.items():
             model_path = self.models_dir / model_name
-            if not model_path.exists():
+            if info.url and not model_path.exists():
                 available_downloads[str(counter)] = (model_name, info)
-                gender_icon = "👨" if info['gender'] == "Masculino" else "👩"
-                print(f"  {counter}️⃣ {gender_icon} {info['name']} - {info['description']}")
-                print(f"      📊 {info['quality']} | {info['size_mb']}MB")
+                gender_icon = "👨" if info.gender == "Masculino" else "👩"
+                print(f"  {counter}️⃣ {gender_icon} {info.name} - {info.description}")
+                print(f"      📊 {info.quality} | {info.size_mb}MB")
                 counter += 1
         
         if not available_downloads:
@@ -299,10 +281,10 @@ class MenuInterface:
             
         return self.get_piper_model()
     
-    def _download_single_model(self, model_name: str, info: dict) -> bool:
+    def _download_single_model(self, model_name: str, info: PiperModelInfo) -> bool:
         """Download de modelo específico."""
         try:
-            url = info.get('url')
+            url = info.url
             if not url:
                 print(f"❌ URL não disponível")
                 return False
@@ -5,13 +5,22 @@ Utilitários gerais para o sistema.
 """
 
 import re
+import hashlib
+import functools
 from pathlib import Path
 
+FORBIDDEN_FS_CHARS = "\\/:*?\"<>|\n\r\t"
+_forbidden_table = str.maketrans({c: "-" for c in FORBIDDEN_FS_CHARS})
+_multiple_space_re = re.compile(r"\s+")
 
+
+@functools.lru_cache(maxsize=4096)
 def sanitize_filename(name: str, max_len: int = 120) -> str:
     """
     Sanitiza nome do arquivo removendo caracteres proibidos.
     
+    Memoizado: é uma função pura chamada várias vezes com os mesmos títulos.
+    
     Args:
         name: Nome para sanitizar
         max_len: Comprimento máximo do nome
@@ -19,13 +28,9 @@ def sanitize_filename(name: str, max_len: int = 120) -> str:
     Returns:
         Nome sanitizado
     """
-    forbidden_chars = r"\\/:*?\"<>|\n\r\t"
-    forbidden_re = re.compile(f"[{forbidden_chars}]")
-    multiple_space_re = re.compile(r"\s+")
-    
     name = name.strip()
-    name = multiple_space_re.sub(" ", name)
-    name = forbidden_re.sub("-", name)
+    name = _multiple_space_re.sub(" ", name)
+    name = name.translate(_forbidden_table)
     
     if not name:
         name = "Sem título"
@@ -33,6 +38,19 @@ def sanitize_filename(name: str, max_len: int = 120) -> str:
     return name[:max_len].rstrip(" .")
 
 
+def pad_width(total: int) -> int:
+    """
+    Calcula a largura do índice com zero padding.
+    
+    Args:
+        total: Número total de itens
+        
+    Returns:
+        Número de dígitos (mínimo 2)
+    """
+    return max(2, len(str(total)))
+
+
 def zero_pad(i: int, total: int) -> str:
     """
     Retorna número com zero padding baseado no total.
@@ -44,8 +62,7 @@ def zero_pad(i: int, total: int) -> str:
     Returns:
         String com padding de zeros
     """
-    width = max(2, len(str(total)))
-    return str(i).zfill(width)
+    return f"{i:0{pad_width(total)}d}"
 
 
 def format_file_size(size_bytes: int) -> str:
@@ -144,15 +161,27 @@ def validate_audio_file(file_path: Path) -> bool:
     Returns:
         True se o arquivo for válido
     """
-    if not file_path.exists():
-        return False
-    
     try:
+        # Um único stat: arquivo ausente cai no except
         size = file_path.stat().st_size
-        # Arquivo deve ter pelo menos 1KB (muito pequeno indica erro)
-        return size > 1024
-    except Exception:
+    except OSError:
         return False
+    
+    # Arquivo deve ter pelo menos 1KB (muito pequeno indica erro)
+    return size > 1024
+
+
+def text_hash(text: str) -> str:
+    """
+    Identifica o conteúdo de um texto (BLAKE2b de 128 bits).
+    
+    Args:
+        text: Texto do capítulo
+        
+    Returns:
+        Hash hexadecimal
+    """
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
 
 
 def get_chapter_filename(index: int, total: int, title: str, extension: str = "mp3") -> str: